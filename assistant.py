@@ -0,0 +1,220 @@
+"""GPT-2 responses to individual answers, with curated fallbacks"""
+from contextlib import closing
+
+from config import RESPONSE_CACHE_CONFIG
+from generation import (
+    QueueFullError,
+    follow_up_complete,
+    generate,
+    generation_params,
+    register_prompt_prefix,
+    stream_generate,
+)
+from keywords import FALLBACK_MATCHER, FOLLOW_UP_MATCHER
+from metrics import metrics
+from response_cache import make_key, response_cache
+
+ANALYSIS_SYSTEM_PROMPT = "You are a professional psychologist conducting a personality assessment. Provide brief, insightful responses about personality traits based on user answers. Keep responses under 50 words and focus on positive insights."
+
+# Fixed instructions come before the question and answer, so every analysis
+# prompt shares them as a prefix whose KV-cache GPT-2 computes only once
+ANALYSIS_INSTRUCTIONS = """You are a professional psychologist conducting a personality assessment. 
+
+Please provide a thoughtful analysis of their response:
+1. Give a brief acknowledgment of their answer (1 sentence)
+2. Make one insightful observation about what their response reveals about their personality, thinking patterns, or emotional approach (1-2 sentences)
+
+Be professional, supportive, and encouraging. Provide analysis and insights only - do NOT ask any follow-up questions. Keep your total response to exactly 2-3 sentences maximum."""
+
+ANALYSIS_PROMPT_PREFIX = f"{ANALYSIS_SYSTEM_PROMPT}\n\nUser: {ANALYSIS_INSTRUCTIONS}\n\nQuestion"
+register_prompt_prefix(ANALYSIS_PROMPT_PREFIX)
+
+def build_prompt(user_prompt, system_prompt):
+    """The full GPT-2 prompt for a system and user prompt"""
+    return f"{system_prompt}\n\nUser: {user_prompt}\nAssistant:"
+
+def clean_model_response(response):
+    """Drop a trailing incomplete sentence from generated text"""
+    if not response or len(response.split()) < 3:
+        raise Exception("Generated response too short")
+        
+    # Remove any incomplete sentences
+    sentences = response.split('.')
+    if len(sentences) > 1:
+        response = '. '.join(sentences[:-1]) + '.'
+    
+    return response
+
+def cached_model_response(prompt, params):
+    """Cleaned response already generated for a full prompt, or None"""
+    if not RESPONSE_CACHE_CONFIG["enabled"]:
+        return None
+    return response_cache.get(make_key(prompt, params))
+
+def finish_model_response(prompt, params, generated):
+    """Clean generated text and cache it, so repeated prompts skip generation"""
+    response = clean_model_response(generated)
+    if RESPONSE_CACHE_CONFIG["enabled"]:
+        response_cache.set(make_key(prompt, params), response)
+    return response
+
+def model_response_fallback(error, user_prompt, system_prompt):
+    """Curated response after generation failed with ``error``"""
+    if isinstance(error, QueueFullError):
+        # Generation queue is saturated - answer immediately instead of waiting
+        metrics.incr("generation_queue_full")
+    else:
+        # Fallback to curated responses if transformers fails
+        metrics.incr("fallback_responses")
+    return get_fallback_response(user_prompt, system_prompt)
+
+def generate_model_response(user_prompt, system_prompt):
+    """Cleaned GPT-2 response, raising instead of falling back when generation fails"""
+    # Create a prompt that combines system and user input
+    prompt = build_prompt(user_prompt, system_prompt)
+    params = generation_params()
+    cached = cached_model_response(prompt, params)
+    if cached is not None:
+        return cached
+    
+    # Queue the prompt so concurrent sessions share one batched generate call
+    return finish_model_response(prompt, params, generate(prompt, params))
+
+def get_model_response(user_prompt, system_prompt):
+    """Generate AI response using Hugging Face Transformers GPT-2 with smart fallbacks"""
+    try:
+        return generate_model_response(user_prompt, system_prompt)
+    except Exception as e:
+        return model_response_fallback(e, user_prompt, system_prompt)
+
+def get_fallback_response(user_prompt, system_prompt):
+    """Fallback response system when transformers is not available"""
+    import random
+    
+    # High-quality curated responses for reliable output
+    response_patterns = {
+        'stress': [
+            "Thank you for sharing. Your stress management approach shows excellent emotional regulation and self-care awareness.",
+            "This response demonstrates mature coping strategies and good understanding of your emotional needs.",
+            "Your approach to stress reveals strong resilience and practical problem-solving skills."
+        ],
+        'decision': [
+            "Thank you for sharing. Your decision-making process shows thoughtful analysis and consideration of consequences.",
+            "This response demonstrates excellent critical thinking and balanced evaluation of options.",
+            "Your approach reveals strong analytical skills and careful consideration of different perspectives."
+        ],
+        'conflict': [
+            "Thank you for sharing. Your conflict resolution style shows excellent interpersonal skills and emotional maturity.",
+            "This response demonstrates strong communication abilities and empathetic understanding of others.",
+            "Your approach reveals good social intelligence and diplomatic problem-solving skills."
+        ],
+        'growth': [
+            "Thank you for sharing. Your response shows excellent growth mindset and commitment to self-improvement.",
+            "This demonstrates strong self-awareness and openness to learning from experiences.",
+            "Your perspective reveals mature self-reflection and dedication to personal development."
+        ],
+        'default': [
+            "Thank you for your thoughtful response. This shows excellent self-awareness and genuine reflection.",
+            "Your answer reveals strong emotional intelligence and honest self-assessment.",
+            "This response demonstrates mature thinking and authentic personal insight.",
+            "Thank you for sharing. Your perspective shows deep consideration and self-understanding.",
+            "Your response indicates excellent introspective abilities and thoughtful analysis.",
+            "This answer shows great authenticity and meaningful self-reflection.",
+            "Thank you for sharing. Your response demonstrates strong personal awareness and insight."
+        ]
+    }
+    
+    # Determine response category based on user prompt keywords
+    prompt_lower = user_prompt.lower()
+    category = FALLBACK_MATCHER.first_category(prompt_lower, default='default')
+    
+    # Return curated response
+    return random.choice(response_patterns[category])
+
+def get_short_answer_follow_up(question, user_response):
+    """Canned follow-up question for very short answers, or None"""
+    # Check if response is too short (1-3 words only)
+    word_count = len(user_response.strip().split())
+    
+    if word_count > 3:
+        return None
+    
+    # Generate follow-up question for short answers
+    follow_up_questions = {
+        'stress': "Can you tell me more about what specific techniques work best for you?",
+        'decision': "What factors do you usually consider when making this type of decision?", 
+        'social': "How do you feel in those situations? What do you enjoy most about them?",
+        'challenge': "Can you share a specific example of how you handled this?",
+        'goals': "What motivates you most when working toward this type of goal?",
+        'default': "Can you elaborate a bit more on your thoughts about this?"
+    }
+    
+    # Determine follow-up category
+    question_lower = question.lower()
+    follow_up_category = FOLLOW_UP_MATCHER.first_category(question_lower, default='default')
+    
+    follow_up = follow_up_questions[follow_up_category]
+    return f"Thank you for sharing! {follow_up}"
+
+def build_analysis_prompts(question, user_response, question_number):
+    """User and system prompts for analysing a single answer"""
+    prompt = f"""{ANALYSIS_INSTRUCTIONS}
+
+Question {question_number}/10: {question}
+User's Response: {user_response}"""
+    return prompt, ANALYSIS_SYSTEM_PROMPT
+
+def remove_follow_up_questions(ai_response):
+    """Cut the analysis at the first question mark"""
+    if "?" in ai_response:
+        question_end = ai_response.find("?")
+        ai_response = ai_response[:question_end].strip()
+        # Add a period if the sentence doesn't end with punctuation
+        if ai_response and not ai_response.endswith(('.', '!', ':')):
+            ai_response += "."
+    
+    return ai_response
+
+def get_ai_response(question, user_response, question_number):
+    """Get response from AI for personality analysis with follow-up logic"""
+    follow_up = get_short_answer_follow_up(question, user_response)
+    if follow_up:
+        return follow_up
+    
+    # For longer answers, provide analysis
+    prompt, system_prompt = build_analysis_prompts(question, user_response, question_number)
+    ai_response = get_model_response(user_prompt=prompt, system_prompt=system_prompt)
+    
+    # Remove any questions that might appear - cut at any question mark
+    return remove_follow_up_questions(ai_response)
+
+def stream_ai_response(question, user_response, question_number):
+    """Streaming variant of get_ai_response.
+    
+    Yields the response text accumulated so far while GPT-2 is generating and
+    stops generation as soon as the trimming rules would discard further
+    tokens. The last value yielded is the final, cleaned response.
+    """
+    follow_up = get_short_answer_follow_up(question, user_response)
+    if follow_up:
+        yield follow_up
+        return
+    
+    prompt, system_prompt = build_analysis_prompts(question, user_response, question_number)
+    full_prompt = build_prompt(prompt, system_prompt)
+    
+    try:
+        params = generation_params()
+        ai_response = cached_model_response(full_prompt, params)
+        if ai_response is None:
+            text = ""
+            # Closing the stream stops GPT-2 if our own consumer goes away
+            with closing(stream_generate(full_prompt, params, stop=follow_up_complete)) as chunks:
+                for chunk in chunks:
+                    text += chunk
+                    yield text.strip()
+            ai_response = finish_model_response(full_prompt, params, text.strip())
+    except Exception as e:
+        ai_response = model_response_fallback(e, prompt, system_prompt)
+    
+    yield remove_follow_up_questions(ai_response)
@@ -0,0 +1,178 @@
+"""Asyncio API over the inference paths.
+
+``await generate(...)`` and ``await classify_batch(...)`` queue work on the same
+micro-batchers as the blocking calls, without holding a thread while they
+wait, so sentiment, keyword scoring and insight generation for an answer can be
+fired together and gathered:
+
+    features, insight = await asyncio.gather(
+        answer_features(response), answer_insight(question, response, number),
+    )
+
+Cancelling an awaiting task drops its queued requests before they reach a
+model. Remote model-server calls and CPU-bound keyword matching run in a
+shared worker thread pool instead.
+
+Synchronous callers such as the Streamlit script use ``submit(coro)``, which
+runs the coroutine on a background event loop and returns a
+``concurrent.futures.Future``; cancelling that future cancels the coroutine.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import assistant
+import engine
+import generation
+import sentiment
+from batching import QueueFullError
+from config import ASYNC_CONFIG, GENERATION_CONFIG, SENTIMENT_CONFIG
+from keywords import SCORING_MATCHER
+from metrics import metrics
+from model_server import call_with_fallback, get_model_server_client
+
+_executor = ThreadPoolExecutor(max_workers=ASYNC_CONFIG["workers"], thread_name_prefix="async-inference")
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop():
+    """Process-wide event loop running in a daemon thread"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-client-loop", daemon=True).start()
+            _loop = loop
+    return _loop
+
+
+def submit(coro):
+    """Run ``coro`` on the background loop; returns a cancellable concurrent Future"""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Await ``fn(*args, **kwargs)`` run in the worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def _gather_futures(futures, timeout):
+    """Await concurrent Futures, cancelling every one that has not started on failure"""
+    waiters = [asyncio.wrap_future(future) for future in futures]
+    try:
+        _, pending = await asyncio.wait(waiters, timeout=timeout)
+        if pending:
+            raise asyncio.TimeoutError(f"no result within {timeout}s")
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    return [waiter.result() for waiter in waiters]
+
+
+async def generate(prompt, params=None, timeout=None):
+    """Async ``generation.generate``: a continuation from the shared scheduler or model server.
+
+    Raises ``QueueFullError`` when the scheduler is saturated and
+    ``asyncio.TimeoutError`` when no result arrives within ``timeout`` seconds.
+    """
+    if params is None:
+        params = generation.generation_params()
+    if timeout is None:
+        timeout = GENERATION_CONFIG["timeout"]
+    if get_model_server_client() is not None:
+        return await run_blocking(generation.generate, prompt, params, timeout)
+    metrics.incr("async_generations")
+    return (await _gather_futures([generation.submit_local(prompt, params)], timeout))[0]
+
+
+async def classify_batch(texts, timeout=None):
+    """Async ``sentiment.classify_batch``: one ``{'label', 'score'}`` dict per text"""
+    texts = list(texts)
+    if not texts:
+        return []
+    if get_model_server_client() is not None or not SENTIMENT_CONFIG["cross_session_batching"]:
+        # Remote and unbatched scoring block, so they run in the pool
+        return await run_blocking(
+            call_with_fallback,
+            lambda client: client.classify(texts),
+            lambda: sentiment.classify_batch(texts),
+        )
+    try:
+        futures = sentiment.sentiment_engine.submit(texts)
+    except QueueFullError:
+        return await run_blocking(sentiment.classify_batch, texts)
+    try:
+        return await _gather_futures(futures, SENTIMENT_CONFIG["timeout"] if timeout is None else timeout)
+    except asyncio.TimeoutError:
+        # Saturated batcher: score these texts directly
+        return await run_blocking(sentiment.classify_batch, texts)
+
+
+async def _sentiment_or_none(texts):
+    """Sentiment for ``texts``, or None when the model is unavailable"""
+    try:
+        return await classify_batch(texts)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        # Left to the full analysis, which falls back to keywords
+        return None
+
+
+async def match_keywords(response):
+    """``engine.answer_keywords``: sorted scoring keywords in one answer"""
+    return await run_blocking(engine.answer_keywords, response)
+
+
+async def generate_model_response(user_prompt, system_prompt):
+    """Async ``assistant.generate_model_response``: raises instead of falling back"""
+    prompt = assistant.build_prompt(user_prompt, system_prompt)
+    params = generation.generation_params()
+    cached = assistant.cached_model_response(prompt, params)
+    if cached is not None:
+        return cached
+    return assistant.finish_model_response(prompt, params, await generate(prompt, params))
+
+
+async def model_response(user_prompt, system_prompt):
+    """Async ``assistant.get_model_response``, with the same cache and curated fallbacks"""
+    try:
+        return await generate_model_response(user_prompt, system_prompt)
+    except Exception as e:
+        return assistant.model_response_fallback(e, user_prompt, system_prompt)
+
+
+async def answer_insight(question, user_response, question_number):
+    """Async ``assistant.get_ai_response``"""
+    follow_up = assistant.get_short_answer_follow_up(question, user_response)
+    if follow_up:
+        return follow_up
+    prompt, system_prompt = assistant.build_analysis_prompts(question, user_response, question_number)
+    return assistant.remove_follow_up_questions(await model_response(prompt, system_prompt))
+
+
+async def answer_features(response, use_ai=True):
+    """Async ``engine.extract_answer_features``: keywords and sentiment gathered concurrently"""
+    keywords, sentiment_results = await asyncio.gather(
+        match_keywords(response),
+        _sentiment_or_none([response]) if engine.wants_answer_sentiment(response, use_ai) else asyncio.sleep(0),
+    )
+    return engine.make_answer_features(response, keywords, sentiment_results[0] if sentiment_results else None)
+
+
+async def analyze(responses, name, age, use_ai=True):
+    """Async ``engine.analyze_personality_traits``, scoring sentiment and keywords concurrently"""
+    texts = [response for response in responses if response.strip()]
+    keyword_hits, sentiment_results = await asyncio.gather(
+        run_blocking(SCORING_MATCHER.match, ' '.join(responses).lower()),
+        _sentiment_or_none(texts) if use_ai else asyncio.sleep(0),
+    )
+    return await run_blocking(
+        engine.analyze_personality_traits, responses, name, age,
+        sentiment_results=sentiment_results, use_ai=use_ai, keyword_hits=keyword_hits,
+    )
@@ -0,0 +1,69 @@
+"""CPU inference backends for the GPT-2 generation model.
+
+- ``torch``: eager fp32 PyTorch (the original behaviour)
+- ``quantized``: dynamic int8 quantization of every linear projection
+- ``onnx``: ONNX Runtime export with KV-cache, via the optional ``optimum`` package
+"""
+from config import MODEL_CONFIG
+from lazy import torch, transformers
+
+GENERATION_BACKENDS = ("torch", "quantized", "onnx")
+
+
+def load_tokenizer(model_name):
+    tokenizer = transformers.GPT2Tokenizer.from_pretrained(model_name)
+
+    # Set pad token; left padding keeps batched prompts aligned for generation
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"
+    return tokenizer
+
+
+def load_torch_model(model_name):
+    model = transformers.GPT2LMHeadModel.from_pretrained(model_name)
+    model.eval()
+    return model
+
+
+def _conv1d_to_linear(model):
+    """Swap GPT-2's Conv1D projections for nn.Linear so they can be quantized"""
+    from transformers.pytorch_utils import Conv1D
+
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if isinstance(child, Conv1D):
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features)
+                linear.weight.data = child.weight.data.t().contiguous()
+                linear.bias.data = child.bias.data
+                setattr(parent, name, linear)
+    return model
+
+
+def load_quantized_model(model_name):
+    model = _conv1d_to_linear(load_torch_model(model_name))
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_onnx_model(model_name):
+    # Optional dependency: pip install "optimum[onnxruntime]"
+    from optimum.onnxruntime import ORTModelForCausalLM
+
+    return ORTModelForCausalLM.from_pretrained(model_name, export=True, use_cache=True)
+
+
+_LOADERS = {
+    "torch": load_torch_model,
+    "quantized": load_quantized_model,
+    "onnx": load_onnx_model,
+}
+
+
+def load_generation_model(backend=None, model_name=None):
+    """Load ``(tokenizer, model)`` for the requested backend"""
+    backend = backend or MODEL_CONFIG["generation_backend"]
+    model_name = model_name or MODEL_CONFIG["generation_model"]
+    if backend not in _LOADERS:
+        raise ValueError(f"Unknown generation backend '{backend}', expected one of {GENERATION_BACKENDS}")
+    return load_tokenizer(model_name), _LOADERS[backend](model_name)
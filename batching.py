@@ -0,0 +1,149 @@
+"""Micro-batching queue shared by the inference paths.
+
+Streamlit runs every session in its own script thread. Work submitted from those
+threads is collected here for a short window and handed to a single worker
+thread as one batch, so concurrent sessions share one forward pass.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class QueueFullError(Exception):
+    """Raised when the batcher has no room for more pending work"""
+
+
+class _PendingItem:
+    __slots__ = ("item", "result", "error", "done", "cancelled", "future")
+
+    def __init__(self, item, future=None):
+        self.item = item
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        self.cancelled = False
+        self.future = future
+
+    def is_live(self):
+        """False once the caller gave up; a Future caller can no longer cancel after this"""
+        if self.cancelled:
+            return False
+        return self.future is None or self.future.set_running_or_notify_cancel()
+
+
+class MicroBatcher:
+    """Collects items from many threads and processes them in batches.
+
+    ``process_batch`` receives a list of items and must return a list of results
+    in the same order.
+    """
+
+    def __init__(self, process_batch, max_batch_size=16, max_wait=0.02, max_queue=256, name="micro-batcher"):
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self.batches_run = 0
+        self.items_processed = 0
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._worker.start()
+
+    def pending(self):
+        """Number of items waiting for the worker"""
+        return self._queue.qsize()
+
+    def submit(self, item, timeout=None):
+        """Queue one item and block until its result is ready"""
+        return self.submit_many([item], timeout=timeout)[0]
+
+    def submit_many(self, items, timeout=None):
+        """Queue several items together and block until all results are ready.
+
+        Raises ``QueueFullError`` when the queue is saturated and ``TimeoutError``
+        when the results are not ready within ``timeout`` seconds.
+        """
+        self._ensure_worker()
+        pending = [_PendingItem(item) for item in items]
+        for index, entry in enumerate(pending):
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                for queued in pending[:index]:
+                    queued.cancelled = True
+                raise QueueFullError(f"{self.name} queue is full")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for entry in pending:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not entry.done.wait(remaining):
+                for queued in pending:
+                    queued.cancelled = True
+                raise TimeoutError(f"{self.name} did not answer within {timeout}s")
+
+        for entry in pending:
+            if entry.error is not None:
+                raise entry.error
+        return [entry.result for entry in pending]
+
+    def submit_futures(self, items):
+        """Queue several items without blocking; returns one Future per item.
+
+        Cancelling a Future before its batch starts drops the item. Raises
+        ``QueueFullError`` (queueing none of them) when the queue is saturated.
+        """
+        self._ensure_worker()
+        pending = [_PendingItem(item, Future()) for item in items]
+        for index, entry in enumerate(pending):
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                for queued in pending[:index]:
+                    queued.cancelled = True
+                raise QueueFullError(f"{self.name} queue is full")
+        return [entry.future for entry in pending]
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Requests whose caller already gave up are dropped before inference
+        return [entry for entry in batch if entry.is_live()]
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                results = self.process_batch([entry.item for entry in batch])
+                for entry, result in zip(batch, results):
+                    entry.result = result
+            except Exception as e:
+                for entry in batch:
+                    entry.error = e
+            self.batches_run += 1
+            self.items_processed += len(batch)
+            for entry in batch:
+                entry.done.set()
+                if entry.future is not None:
+                    if entry.error is not None:
+                        entry.future.set_exception(entry.error)
+                    else:
+                        entry.future.set_result(entry.result)
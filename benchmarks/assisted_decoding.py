@@ -0,0 +1,98 @@
+"""Tokens per second of plain vs assisted (speculative) GPT-2 decoding on CPU.
+
+Each sample prompt is generated with the app's sampling parameters, first by
+the main model alone and then with the draft model proposing tokens. Greedy
+outputs are also compared: assisted decoding must reproduce them exactly,
+since the main model verifies every drafted token.
+
+Usage: python -m benchmarks.assisted_decoding [--draft distilgpt2] [--repeats 3] [--output report.json]
+"""
+import argparse
+import time
+
+from backends import load_torch_model
+from benchmarks.backends import SAMPLE_PROMPTS, greedy_tokens
+from benchmarks.common import current_rss_bytes, summarize_latencies, write_report
+from config import GENERATION_CONFIG
+from generation import generation_params
+from models import get_generation_model
+
+
+def time_decoding(tokenizer, model, params, repeats, draft=None):
+    import torch
+
+    latencies = []
+    new_tokens = 0
+    extra = {"assistant_model": draft} if draft is not None else {}
+    for _ in range(repeats):
+        for prompt in SAMPLE_PROMPTS:
+            inputs = tokenizer(prompt, return_tensors="pt")
+            start = time.perf_counter()
+            with torch.no_grad():
+                outputs = model.generate(
+                    inputs["input_ids"],
+                    attention_mask=inputs["attention_mask"],
+                    pad_token_id=tokenizer.eos_token_id,
+                    **extra,
+                    **params
+                )
+            latencies.append(time.perf_counter() - start)
+            new_tokens += outputs.shape[1] - inputs["input_ids"].shape[1]
+    summary = summarize_latencies(latencies)
+    summary["new_tokens"] = new_tokens
+    summary["tokens_per_second"] = round(new_tokens / sum(latencies), 2)
+    return summary
+
+
+def greedy_agreement(tokenizer, model, draft, max_new_tokens):
+    """Share of prompts whose greedy output is unchanged by assisted decoding"""
+    import torch
+
+    identical = 0
+    for prompt in SAMPLE_PROMPTS:
+        plain = greedy_tokens(tokenizer, model, prompt, max_new_tokens)
+        inputs = tokenizer(prompt, return_tensors="pt")
+        with torch.no_grad():
+            outputs = model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                pad_token_id=tokenizer.eos_token_id,
+                assistant_model=draft,
+            )
+        identical += int(outputs[0, inputs["input_ids"].shape[1]:].tolist() == plain)
+    return identical / len(SAMPLE_PROMPTS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--draft", default=GENERATION_CONFIG["draft_model"] or "distilgpt2")
+    parser.add_argument("--max-new-tokens", type=int, default=GENERATION_CONFIG["max_new_tokens"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Also write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    tokenizer, model = get_generation_model()
+    rss_before = current_rss_bytes()
+    start = time.perf_counter()
+    draft = load_torch_model(args.draft)
+    report = {
+        "draft_model": args.draft,
+        "draft_load_seconds": round(time.perf_counter() - start, 3),
+        "draft_rss_delta_mb": round((current_rss_bytes() - rss_before) / 1e6, 1),
+    }
+
+    params = dict(generation_params(max_new_tokens=args.max_new_tokens))
+    # Warm both paths so neither pays first-call overhead in the timings
+    time_decoding(tokenizer, model, params, 1)
+    time_decoding(tokenizer, model, params, 1, draft)
+    report["plain"] = time_decoding(tokenizer, model, params, args.repeats)
+    report["assisted"] = time_decoding(tokenizer, model, params, args.repeats, draft)
+    report["speedup"] = round(report["assisted"]["tokens_per_second"] / report["plain"]["tokens_per_second"], 2)
+    report["greedy_agreement"] = greedy_agreement(tokenizer, model, draft, args.max_new_tokens)
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Validate the generation backends against the fp32 baseline and time them.
+
+Usage: python -m benchmarks.backends [--backends torch quantized onnx] [--output report.json]
+"""
+import argparse
+import time
+
+from backends import GENERATION_BACKENDS, load_generation_model
+from benchmarks.common import current_rss_bytes, summarize_latencies, write_report
+
+SAMPLE_PROMPTS = [
+    "You are a professional psychologist conducting a personality assessment.\n\nUser: I recharge by spending quiet time alone with a book.\nAssistant:",
+    "You are a professional psychologist conducting a personality assessment.\n\nUser: When I am stressed I make a list and tackle one thing at a time.\nAssistant:",
+    "You are a professional psychologist conducting a personality assessment.\n\nUser: I love brainstorming new ideas with my team and trying unusual designs.\nAssistant:",
+]
+
+
+def next_token_logits(tokenizer, model, prompts):
+    import torch
+
+    logits = []
+    with torch.no_grad():
+        for prompt in prompts:
+            inputs = tokenizer(prompt, return_tensors="pt")
+            outputs = model(input_ids=inputs["input_ids"], attention_mask=inputs["attention_mask"])
+            logits.append(outputs.logits[0, -1].float())
+    return logits
+
+
+def greedy_tokens(tokenizer, model, prompt, max_new_tokens):
+    import torch
+
+    inputs = tokenizer(prompt, return_tensors="pt")
+    with torch.no_grad():
+        outputs = model.generate(
+            inputs["input_ids"],
+            attention_mask=inputs["attention_mask"],
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            pad_token_id=tokenizer.eos_token_id,
+        )
+    return outputs[0, inputs["input_ids"].shape[1]:].tolist()
+
+
+def compare_to_baseline(baseline, candidate, tokenizer, max_new_tokens):
+    """Logit drift and greedy-output agreement between two models"""
+    base_logits = next_token_logits(tokenizer, baseline, SAMPLE_PROMPTS)
+    cand_logits = next_token_logits(tokenizer, candidate, SAMPLE_PROMPTS)
+
+    max_abs_diff = max(float((b - c).abs().max()) for b, c in zip(base_logits, cand_logits))
+    top1_agreement = sum(int(b.argmax() == c.argmax()) for b, c in zip(base_logits, cand_logits)) / len(SAMPLE_PROMPTS)
+    top5_overlap = sum(
+        len(set(b.topk(5).indices.tolist()) & set(c.topk(5).indices.tolist())) / 5
+        for b, c in zip(base_logits, cand_logits)
+    ) / len(SAMPLE_PROMPTS)
+
+    matched = total = 0
+    for prompt in SAMPLE_PROMPTS:
+        base_tokens = greedy_tokens(tokenizer, baseline, prompt, max_new_tokens)
+        cand_tokens = greedy_tokens(tokenizer, candidate, prompt, max_new_tokens)
+        matched += sum(int(b == c) for b, c in zip(base_tokens, cand_tokens))
+        total += max(len(base_tokens), len(cand_tokens))
+
+    return {
+        "max_abs_logit_diff": round(max_abs_diff, 5),
+        "top1_agreement": top1_agreement,
+        "top5_overlap": round(top5_overlap, 3),
+        "greedy_token_agreement": round(matched / total, 3) if total else 1.0,
+    }
+
+
+def time_generation(tokenizer, model, max_new_tokens, repeats):
+    latencies = []
+    for _ in range(repeats):
+        for prompt in SAMPLE_PROMPTS:
+            start = time.perf_counter()
+            greedy_tokens(tokenizer, model, prompt, max_new_tokens)
+            latencies.append(time.perf_counter() - start)
+    summary = summarize_latencies(latencies)
+    summary["tokens_per_second"] = round(max_new_tokens * len(latencies) / sum(latencies), 2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=list(GENERATION_BACKENDS), choices=GENERATION_BACKENDS)
+    parser.add_argument("--max-new-tokens", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Also write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    baseline_tokenizer, baseline = load_generation_model("torch")
+    report = {"max_new_tokens": args.max_new_tokens, "backends": {}}
+
+    for backend in args.backends:
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+        try:
+            tokenizer, model = load_generation_model(backend)
+        except ImportError as e:
+            report["backends"][backend] = {"error": f"backend unavailable: {e}"}
+            continue
+        entry = {
+            "load_seconds": round(time.perf_counter() - start, 3),
+            "rss_delta_mb": round((current_rss_bytes() - rss_before) / 1e6, 1),
+            "latency": time_generation(tokenizer, model, args.max_new_tokens, args.repeats),
+        }
+        if backend != "torch":
+            entry["validation"] = compare_to_baseline(baseline, model, baseline_tokenizer, args.max_new_tokens)
+        report["backends"][backend] = entry
+        del model
+
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Latency, throughput and memory of the analysis and generation hot paths.
+
+Synthetic corpora of 8-answer assessments (from a single assessment up to
+10k, with short to long answers) are pushed through ``analyze_with_keywords``,
+``analyze_with_ai``, ``analyze_personality_traits`` (cold and memoized) and
+``generate_personality_diagnosis``. GPT-2 generation inside those stages is
+replaced by a fixed insight, so they time the scoring code rather than one
+generation per assessment. With ``--models`` the GPT-2 and sentiment models are
+also timed cold (first call, including the load) and warm.
+
+Corpora are seeded, so runs are comparable across commits.
+
+Usage:
+    python -m benchmarks.bench_hot_paths [--assessments 1 100 1000 10000]
+        [--answer-words 10 60 200] [--models] [--output report.json]
+"""
+import argparse
+import random
+import time
+
+import engine
+from benchmarks.common import current_rss_bytes, peak_rss_bytes, summarize_latencies, write_report
+from keywords import AGGRESSIVE_KEYWORDS, TRAIT_KEYWORDS
+from response_cache import ResponseCache
+
+ANSWERS_PER_ASSESSMENT = 8
+
+FILLER_WORDS = (
+    "i you we the a and or but when because usually often sometimes really think feel "
+    "work friends family people time day week weekend home team project plan try like "
+    "enjoy prefer find get make take quiet busy new old small big good hard easy"
+).split()
+KEYWORDS = [word for words in TRAIT_KEYWORDS.values() for word in words] + AGGRESSIVE_KEYWORDS
+
+
+def make_corpus(assessments, answer_words, seed=0, keyword_rate=0.15):
+    """Seeded list of ``(name, age, responses)`` assessments"""
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(assessments):
+        responses = []
+        for _ in range(ANSWERS_PER_ASSESSMENT):
+            words = [
+                rng.choice(KEYWORDS) if rng.random() < keyword_rate else rng.choice(FILLER_WORDS)
+                for _ in range(max(1, int(rng.gauss(answer_words, answer_words / 4))))
+            ]
+            responses.append(" ".join(words).capitalize() + ".")
+        corpus.append((f"User {index}", str(rng.randint(16, 70)), responses))
+    return corpus
+
+
+def synthetic_sentiment(responses, seed=0):
+    """Stand-in sentiment results so analysis can be timed without the model"""
+    rng = random.Random(seed)
+    return [
+        {"label": rng.choice(("POSITIVE", "NEGATIVE")), "score": rng.uniform(0.5, 1.0)}
+        for response in responses if response.strip()
+    ]
+
+
+def synthetic_insight(user_prompt, system_prompt):
+    """Stand-in GPT-2 insight so the trait pass can be timed without the model"""
+    return "Your answers show a logical, creative and supportive approach to challenges."
+
+
+def timed(fn, items):
+    """Call ``fn`` on every item, returning the latency summary and throughput"""
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        call_start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    summary = summarize_latencies(latencies)
+    summary["per_second"] = round(len(latencies) / elapsed, 2) if elapsed else 0.0
+    summary["peak_rss_mb"] = round(peak_rss_bytes() / 1e6, 1)
+    return summary
+
+
+def bench_analysis(corpus, use_ai):
+    """Every analysis stage over one corpus"""
+    sentiments = [synthetic_sentiment(responses, seed) for seed, (_, _, responses) in enumerate(corpus)]
+    items = list(zip(corpus, sentiments))
+    texts = [" ".join(responses).lower() for _, _, responses in corpus]
+
+    def traits(item):
+        (name, age, responses), sentiment_results = item
+        return engine.analyze_personality_traits(
+            responses, name, age, sentiment_results=sentiment_results, use_ai=use_ai,
+        )
+
+    # A private cache large enough for the whole corpus, so the warm pass is all hits
+    saved_cache = engine.traits_cache
+    saved_generate = engine.generate_model_response
+    engine.traits_cache = ResponseCache(max_entries=len(corpus))
+    engine.generate_model_response = synthetic_insight
+    try:
+        results = {
+            "analyze_with_keywords": timed(engine.analyze_with_keywords, texts),
+            "analyze_with_ai": timed(lambda item: engine.analyze_with_ai(item[0][2], item[1]), items),
+            "analyze_personality_traits_cold": timed(traits, items),
+            "analyze_personality_traits_warm": timed(traits, items),
+        }
+        all_traits = [traits(item) for item in items]
+    finally:
+        engine.traits_cache = saved_cache
+        engine.generate_model_response = saved_generate
+
+    results["generate_personality_diagnosis"] = timed(
+        lambda pair: engine.generate_personality_diagnosis(pair[0][2], pair[0][0], pair[0][1], pair[1]),
+        list(zip(corpus, all_traits)),
+    )
+    return results
+
+
+def bench_models(prompts):
+    """Cold (first call, including the model load) and warm model latency"""
+    from assistant import get_model_response
+    from models import registry
+    from response_cache import response_cache
+    from sentiment import score_responses
+
+    system_prompt = "You are a professional psychologist conducting a personality assessment."
+    registry.clear()
+    response_cache.clear()
+
+    report = {
+        "get_model_response_cold": timed(lambda prompt: get_model_response(prompt, system_prompt), prompts[:1]),
+        "get_model_response_warm": timed(lambda prompt: get_model_response(prompt, system_prompt), prompts[1:]),
+        "get_model_response_cached": timed(lambda prompt: get_model_response(prompt, system_prompt), prompts[1:]),
+    }
+    try:
+        report["score_responses_cold"] = timed(score_responses, [prompts[:ANSWERS_PER_ASSESSMENT]])
+        report["score_responses_warm"] = timed(score_responses, [[prompt] for prompt in prompts])
+    except Exception as e:
+        report["score_responses_error"] = f"{type(e).__name__}: {e}"
+    # get_model_response answers from canned text when GPT-2 could not be loaded
+    report["generation_model_loaded"] = registry.is_loaded("generation")
+    report["sentiment_model_loaded"] = registry.is_loaded("sentiment")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assessments", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--answer-words", type=int, nargs="+", default=[10, 60, 200])
+    parser.add_argument("--use-ai", action="store_true", help="Combine synthetic sentiment with keywords, as the app does")
+    parser.add_argument("--models", action="store_true", help="Also time GPT-2 and sentiment inference")
+    parser.add_argument("--model-prompts", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    report = {"seed": args.seed, "use_ai": args.use_ai, "rss_start_mb": round(current_rss_bytes() / 1e6, 1), "analysis": []}
+    for answer_words in args.answer_words:
+        for assessments in args.assessments:
+            corpus = make_corpus(assessments, answer_words, args.seed)
+            start = time.perf_counter()
+            stages = bench_analysis(corpus, args.use_ai)
+            report["analysis"].append({
+                "assessments": assessments,
+                "answer_words": answer_words,
+                "elapsed_seconds": round(time.perf_counter() - start, 3),
+                "stages": stages,
+            })
+
+    if args.models:
+        prompts = [responses[0] for _, _, responses in make_corpus(args.model_prompts, 20, args.seed)]
+        report["models"] = bench_models(prompts)
+
+    report["peak_rss_mb"] = round(peak_rss_bytes() / 1e6, 1)
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
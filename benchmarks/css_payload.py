@@ -0,0 +1,70 @@
+"""Per-rerun cost of the theme stylesheet, before and after caching.
+
+"Before" renders the full stylesheet template on every rerun, as ``main()``
+used to; "after" is the memoized, minified ``themes.theme_stylesheet``. Bytes
+are the size of the Streamlit ForwardMsg carrying the ``st.markdown`` element,
+i.e. what goes over the websocket on each rerun.
+
+Usage: python -m benchmarks.css_payload [--reruns 1000] [--output report.json]
+"""
+import argparse
+import time
+
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from benchmarks.common import summarize_latencies, write_report
+from themes import COLOR_THEMES, render_stylesheet, theme_stylesheet
+
+
+def message_bytes(body):
+    """Serialized size of the delta message for one ``st.markdown(body)``"""
+    msg = ForwardMsg()
+    msg.delta.new_element.markdown.body = body
+    msg.delta.new_element.markdown.allow_html = True
+    return msg.ByteSize()
+
+
+def time_reruns(build, reruns):
+    """Latency of producing the stylesheet once per simulated rerun"""
+    latencies = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        build()
+        latencies.append(time.perf_counter() - start)
+    return summarize_latencies(latencies)
+
+
+def measure_theme(theme_key, reruns):
+    theme = COLOR_THEMES[theme_key]
+    before = render_stylesheet(theme)
+    after = theme_stylesheet(theme_key)
+    return {
+        "theme": theme_key,
+        "before": {
+            "css_bytes": len(before.encode("utf-8")),
+            "message_bytes": message_bytes(before),
+            "render": time_reruns(lambda: render_stylesheet(theme), reruns),
+        },
+        "after": {
+            "css_bytes": len(after.encode("utf-8")),
+            "message_bytes": message_bytes(after),
+            "render": time_reruns(lambda: theme_stylesheet(theme_key), reruns),
+        },
+        "bytes_saved_per_rerun": message_bytes(before) - message_bytes(after),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=1000)
+    parser.add_argument("--output", help="Also write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    write_report(
+        {"reruns": args.reruns, "themes": [measure_theme(key, args.reruns) for key in COLOR_THEMES]},
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Cold import-time report for the app, checked against the startup budget.
+
+Runs ``python -X importtime -c "import personality_app"`` in a fresh interpreter,
+reports the slowest modules and fails when the import exceeds
+STARTUP_CONFIG["import_budget_ms"] or pulls in a deferred ML dependency.
+
+Usage: python -m benchmarks.import_time [--module personality_app] [--top 15] [--output report.json]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks.common import write_report
+from config import STARTUP_CONFIG
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module):
+    """Per-module import timings (microseconds) for a cold import of ``module``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_part, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timings.append({
+            "module": name.strip(),
+            "self_us": int(self_part.strip()),
+            "cumulative_us": int(cumulative_us.strip()),
+        })
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="personality_app")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="Also write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    timings = measure_import(args.module)
+    imported = {entry["module"] for entry in timings}
+    total = next(entry for entry in timings if entry["module"] == args.module)
+    total_ms = total["cumulative_us"] / 1000
+
+    budget_ms = STARTUP_CONFIG["import_budget_ms"]
+    loaded_deferred = [name for name in STARTUP_CONFIG["deferred_modules"] if name in imported]
+    report = {
+        "module": args.module,
+        "total_ms": round(total_ms, 1),
+        "budget_ms": budget_ms,
+        "within_budget": total_ms <= budget_ms,
+        "deferred_modules_imported": loaded_deferred,
+        "slowest": sorted(timings, key=lambda entry: entry["self_us"], reverse=True)[:args.top],
+    }
+    write_report(report, args.output)
+
+    if not report["within_budget"] or loaded_deferred:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
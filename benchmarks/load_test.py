@@ -0,0 +1,205 @@
+"""Concurrent-session load test of the full assessment flow.
+
+Each simulated user drives ``personality_app.py`` through Streamlit's AppTest:
+personal info, 8 submitted answers, then the comprehensive analysis. Users run
+on separate threads inside one process, like sessions sharing one Streamlit
+server, so they compete for the same models, batchers and results writer.
+
+For every concurrency level the report gives session throughput, per-action
+and whole-session latency (p50/p95) and RSS growth. Saved assessments and any
+persisted caches go to a temporary directory, not the app's own files.
+
+Usage: python -m benchmarks.load_test [--users 1 4 8 16] [--think-time 0] [--output report.json]
+"""
+import argparse
+import inspect
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import streamlit
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.common import current_rss_bytes, peak_rss_bytes, summarize_latencies, write_report
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "personality_app.py")
+
+# Streamlit releases whose private Runtime/ScriptCache internals the patches below were checked against
+TESTED_STREAMLIT_VERSIONS = ("1.66",)
+
+
+def _check_streamlit_internals(check_version=True):
+    """Fail loudly when the private Streamlit internals patched below have changed"""
+    version = ".".join(streamlit.__version__.split(".")[:2])
+    if check_version and version not in TESTED_STREAMLIT_VERSIONS:
+        raise RuntimeError(
+            f"load_test patches private Streamlit internals and was checked against Streamlit "
+            f"{', '.join(TESTED_STREAMLIT_VERSIONS)}, not {streamlit.__version__}; re-check "
+            f"_allow_concurrent_apptests and extend TESTED_STREAMLIT_VERSIONS (or pass --skip-version-check)"
+        )
+    missing = [
+        name for owner, name in ((Runtime, "_instance"), (Runtime, "instance"), (Runtime, "exists"), (ScriptCache, "get_bytecode"))
+        if not hasattr(owner, name)
+    ]
+    if missing:
+        raise RuntimeError(f"Streamlit internals patched by load_test are missing: {', '.join(missing)}")
+    if list(inspect.signature(ScriptCache.get_bytecode).parameters) != ["self", "script_path"]:
+        raise RuntimeError("ScriptCache.get_bytecode no longer takes (self, script_path)")
+
+
+def _allow_concurrent_apptests():
+    """Let AppTest runs overlap across threads the way sessions do on a server.
+
+    Every ``AppTest.run`` installs a mock Runtime singleton and removes it when
+    the script finishes, which pulls it out from under sessions still running,
+    so the most recent mock is kept visible. Each run also recompiles the
+    script with a fresh ScriptCache; a server compiles it once, and parallel
+    ``ast.parse`` calls are not thread-safe on some Python versions, so
+    compiled scripts are shared too.
+    """
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+            return cls._instance
+        if "runtime" not in last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last["runtime"]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or "runtime" in last)
+
+    shared_cache = ScriptCache()
+    ScriptCache.get_bytecode = lambda self, script_path, _get=ScriptCache.get_bytecode: _get(shared_cache, script_path)
+
+
+def _isolate_storage(directory):
+    """Point the results store and persisted caches at ``directory``.
+
+    The caches open their files when first imported, so this must run before
+    any app module is loaded.
+    """
+    if "response_cache" in sys.modules:
+        raise RuntimeError("_isolate_storage must run before the app modules are imported")
+    from config import RESPONSE_CACHE_CONFIG, RESULTS_CONFIG, SCORING_CONFIG
+
+    RESULTS_CONFIG["store_path"] = os.path.join(directory, "assessments.sqlite3")
+    # Caches kept in memory stay that way, so the run measures the configured setup
+    if RESPONSE_CACHE_CONFIG["persist_path"]:
+        RESPONSE_CACHE_CONFIG["persist_path"] = os.path.join(directory, "response_cache.sqlite3")
+    if SCORING_CONFIG["traits_cache_path"]:
+        SCORING_CONFIG["traits_cache_path"] = os.path.join(directory, "traits_cache.sqlite3")
+
+
+def _button(at, label):
+    return next(button for button in at.button if label in button.label)
+
+
+def run_session(user, responses, think_time, timeout, timings):
+    """One user's assessment from the welcome page to the saved analysis"""
+    rng = random.Random(user)
+
+    def act(action, step):
+        start = time.perf_counter()
+        step()
+        if at.exception:
+            raise RuntimeError(f"{action}: {at.exception[0].message}")
+        timings.setdefault(action, []).append(time.perf_counter() - start)
+        if think_time:
+            time.sleep(rng.uniform(0, 2 * think_time))
+
+    session_start = time.perf_counter()
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    act("load", at.run)
+
+    def start_assessment():
+        at.text_input[0].input(f"Load User {user}")
+        at.text_input[1].input(str(rng.randint(18, 70)))
+        _button(at, "Start Assessment").click().run()
+
+    act("start", start_assessment)
+    for response in responses:
+        def submit(response=response):
+            at.text_area[0].input(response)
+            _button(at, "Submit").click().run()
+
+        act("submit", submit)
+    act("analysis", lambda: _button(at, "Generate").click().run())
+    timings.setdefault("session", []).append(time.perf_counter() - session_start)
+
+
+def run_level(users, think_time, timeout, answer_words, seed):
+    """Run ``users`` concurrent sessions and summarise them"""
+    from benchmarks.bench_hot_paths import make_corpus
+
+    corpus = make_corpus(users, answer_words, seed)
+    per_user = [{} for _ in range(users)]
+    errors = []
+    rss_before = current_rss_bytes()
+
+    def _worker(index):
+        try:
+            run_session(index, corpus[index][2], think_time, timeout, per_user[index])
+        except Exception as e:
+            errors.append(f"user {index}: {type(e).__name__}: {e}")
+
+    threads = [threading.Thread(target=_worker, args=(index,), name=f"load-user-{index}") for index in range(users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    actions = {}
+    for timings in per_user:
+        for action, latencies in timings.items():
+            actions.setdefault(action, []).extend(latencies)
+    completed = len(actions.get("session", []))
+    return {
+        "users": users,
+        "completed": completed,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions_per_second": round(completed / elapsed, 3) if elapsed else 0.0,
+        "latency": {action: summarize_latencies(latencies) for action, latencies in actions.items()},
+        "rss_growth_mb": round((current_rss_bytes() - rss_before) / 1e6, 1),
+        "rss_growth_per_session_mb": round((current_rss_bytes() - rss_before) / 1e6 / users, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4, 8, 16], help="Concurrency levels to run in turn")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean seconds a user pauses between actions")
+    parser.add_argument("--answer-words", type=int, default=40)
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds allowed for a single script run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this path")
+    parser.add_argument("--skip-version-check", action="store_true", help="Run on an untested Streamlit release")
+    args = parser.parse_args(argv)
+
+    _check_streamlit_internals(check_version=not args.skip_version_check)
+    _allow_concurrent_apptests()
+    with tempfile.TemporaryDirectory(prefix="load-test-") as directory:
+        _isolate_storage(directory)
+        report = {"think_time": args.think_time, "rss_start_mb": round(current_rss_bytes() / 1e6, 1), "levels": []}
+        for users in args.users:
+            report["levels"].append(run_level(users, args.think_time, args.timeout, args.answer_words, args.seed))
+        report["peak_rss_mb"] = round(peak_rss_bytes() / 1e6, 1)
+
+        # Drain pending saves while the directory still exists
+        from results_store import get_result_writer
+
+        get_result_writer().close()
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Re-score stored assessments without the Streamlit UI.
+
+Reads saved ``results/*.json`` files, the SQLite results store and/or JSONL streams of
+``{"name", "age", "responses"}`` records, runs the personality analysis in a
+process pool and streams one JSON line per assessment to the output.
+
+Usage:
+    python bulk_score.py results/ --output rescored.jsonl --workers 4
+    python bulk_score.py results/assessments.sqlite3 --workers 4
+    cat assessments.jsonl | python bulk_score.py - --workers 8
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+
+def iter_records(inputs):
+    """Yield ``(source, record)`` pairs from JSON files, directories and JSONL streams"""
+    for path in inputs:
+        if path == "-":
+            yield from _iter_jsonl(sys.stdin, "<stdin>")
+        elif os.path.isdir(path):
+            for filename in sorted(glob.glob(os.path.join(path, "*.json"))):
+                yield from _iter_json_file(filename)
+        elif path.endswith((".sqlite3", ".db")):
+            from results_store import ResultsStore
+
+            store = ResultsStore(path)
+            for assessment_id, record in store.iter_records():
+                yield f"{path}:{assessment_id}", record
+            store.close()
+        elif path.endswith(".jsonl"):
+            with open(path) as f:
+                yield from _iter_jsonl(f, path)
+        else:
+            yield from _iter_json_file(path)
+
+
+def _iter_json_file(filename):
+    try:
+        with open(filename) as f:
+            yield filename, json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Skipping {filename}: {e}", file=sys.stderr)
+
+
+def _iter_jsonl(stream, source):
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield f"{source}:{line_number}", json.loads(line)
+        except ValueError as e:
+            print(f"Skipping {source}:{line_number}: {e}", file=sys.stderr)
+
+
+def _batched_sentiment(chunk):
+    """Sentiment for every assessment in the chunk from a single padded batch"""
+    from sentiment import classify_batch
+
+    texts, spans = [], []
+    for _, record in chunk:
+        responses = [r for r in record.get("responses", []) if r.strip()]
+        spans.append((len(texts), len(texts) + len(responses)))
+        texts.extend(responses)
+    results = classify_batch(texts)
+    return [results[start:end] for start, end in spans]
+
+
+def score_chunk(chunk, use_ai=True):
+    """Analyse a chunk of ``(source, record)`` pairs; runs inside a worker process"""
+    from engine import assess
+
+    sentiments = [None] * len(chunk)
+    if use_ai:
+        try:
+            sentiments = _batched_sentiment(chunk)
+        except Exception:
+            # Sentiment model unavailable: score with keywords only
+            use_ai = False
+
+    scored = []
+    for (source, record), sentiment_results in zip(chunk, sentiments):
+        try:
+            name = str(record.get("name", ""))
+            age = str(record.get("age", ""))
+            responses = list(record.get("responses", []))
+            report = assess(
+                name, age, responses, record.get("questions", []),
+                sentiment_results=sentiment_results, use_ai=use_ai,
+            )
+            scored.append({
+                "source": source,
+                "name": report.name,
+                "age": report.age,
+                "primary_type": report.primary_type,
+                "traits": report.traits,
+                "analysis": report.analysis,
+            })
+        except Exception as e:
+            scored.append({"source": source, "error": f"{type(e).__name__}: {e}"})
+    return scored
+
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(inputs, output, workers=1, chunk_size=32, use_ai=True):
+    """Score every record and write JSONL to ``output``; returns a throughput summary"""
+    start = time.perf_counter()
+    scored = errors = 0
+
+    def _write(results):
+        nonlocal scored, errors
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+            if "error" in result:
+                errors += 1
+            else:
+                scored += 1
+        output.flush()
+
+    chunks = _chunks(iter_records(inputs), chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            _write(score_chunk(chunk, use_ai))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of chunks in flight so huge inputs stream
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(score_chunk, chunk, use_ai))
+                if len(pending) >= workers * 2:
+                    _write(pending.popleft().result())
+            while pending:
+                _write(pending.popleft().result())
+
+    elapsed = time.perf_counter() - start
+    return {
+        "assessments": scored,
+        "errors": errors,
+        "workers": workers,
+        "elapsed_seconds": round(elapsed, 3),
+        "assessments_per_second": round(scored / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score stored personality assessments")
+    parser.add_argument("inputs", nargs="+", help="results/*.json files, directories, .sqlite3 stores, .jsonl files or - for stdin")
+    parser.add_argument("--output", "-o", help="JSONL output path (default: stdout)")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Assessments per worker task and sentiment batch")
+    parser.add_argument("--keywords-only", action="store_true", help="Skip the sentiment/AI pass")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        summary = run(args.inputs, output, args.workers, args.chunk_size, use_ai=not args.keywords_only)
+    finally:
+        if args.output:
+            output.close()
+
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
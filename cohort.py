@@ -0,0 +1,224 @@
+"""Vectorized keyword scoring for whole cohorts of stored assessments.
+
+Assessments are split into whitespace tokens; keywords are matched once per
+distinct token in a chunk (multi-word keywords are searched for across the
+joined chunk), building a sparse document-term matrix of keyword presence.
+Category scores are then a single product with a term-weight matrix, giving
+exactly what ``analyze_with_keywords`` and the aggressive/concerning counts
+of ``analyze_personality_traits`` compute one user at a time. SciPy is used
+for the sparse product when installed; otherwise NumPy segment sums do the
+same work.
+
+Usage:
+    python cohort.py results/assessments.sqlite3 --output cohort_scores.jsonl
+"""
+import argparse
+import bisect
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from keywords import SCORING_MATCHER, TRAIT_KEYWORDS, keyword_points
+
+try:
+    import scipy.sparse as sparse
+except ImportError:  # Optional: NumPy fallback below
+    sparse = None
+
+# Joins documents into one string; no keyword contains it, so no match spans two documents
+DOCUMENT_SEPARATOR = "\x00"
+
+TERMS = sorted({word for words in SCORING_MATCHER.categories.values() for word in words})
+TERM_INDEX = {term: index for index, term in enumerate(TERMS)}
+WORD_TERMS = frozenset(term for term in TERMS if not any(char.isspace() for char in term))
+PHRASE_TERMS = [term for term in TERMS if term not in WORD_TERMS]
+CATEGORIES = list(SCORING_MATCHER.categories)
+
+
+def _term_weights():
+    """Terms x categories: keyword points for traits, 1 (a hit count) otherwise"""
+    weights = np.zeros((len(TERMS), len(CATEGORIES)), dtype=np.int64)
+    for column, category in enumerate(CATEGORIES):
+        for word in SCORING_MATCHER.categories[category]:
+            weights[TERM_INDEX[word], column] = keyword_points(word) if category in TRAIT_KEYWORDS else 1
+    return weights
+
+
+TERM_WEIGHTS = _term_weights()
+
+
+def assessment_text(responses):
+    """The text analyze_personality_traits scores for one assessment"""
+    return ' '.join(responses).lower()
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _keyword_terms_in_token(token):
+    """Term ids of the single-word keywords inside one whitespace-free token"""
+    return [TERM_INDEX[word] for word in SCORING_MATCHER.find(token) if word in WORD_TERMS]
+
+
+def _word_pairs(texts):
+    """``(rows, terms)`` arrays for keywords without spaces, via each text's tokens.
+
+    A keyword without whitespace occurs in a text exactly when it occurs in
+    one of the text's whitespace-separated tokens, so only distinct tokens
+    need matching; documents then pick up their tokens' keywords.
+    """
+    token_sets = [set(text.split()) for text in texts]
+    lengths = np.fromiter(map(len, token_sets), dtype=np.int64, count=len(token_sets))
+    tokens = list(itertools.chain.from_iterable(token_sets))
+    codes_of = {token: code for code, token in enumerate(dict.fromkeys(tokens))}
+    codes = np.fromiter(map(codes_of.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+    # Token -> keyword terms, as CSR arrays over the chunk's vocabulary
+    token_terms = [_keyword_terms_in_token(token) for token in codes_of]
+    term_counts = np.fromiter(map(len, token_terms), dtype=np.int64, count=len(token_terms))
+    term_indptr = np.zeros(len(token_terms) + 1, dtype=np.int64)
+    np.cumsum(term_counts, out=term_indptr[1:])
+    term_indices = np.fromiter(itertools.chain.from_iterable(token_terms), dtype=np.int64, count=int(term_indptr[-1]))
+
+    # Expand every (document, token) pair into that token's (document, term) pairs
+    repeats = term_counts[codes]
+    total = int(repeats.sum())
+    offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    return np.repeat(rows, repeats), term_indices[np.repeat(term_indptr[codes], repeats) + offsets]
+
+
+def _phrase_pairs(texts):
+    """``(rows, terms)`` arrays for multi-word keywords, searched across the joined texts.
+
+    After a hit the search resumes at the next text, so the Python loop runs
+    once per (text, phrase) pair rather than once per occurrence.
+    """
+    corpus = DOCUMENT_SEPARATOR.join(texts)
+    starts = list(itertools.accumulate((len(text) + len(DOCUMENT_SEPARATOR) for text in texts), initial=0))
+    rows, terms = [], []
+    for word in PHRASE_TERMS:
+        position = corpus.find(word)
+        while position != -1:
+            row = bisect.bisect_right(starts, position) - 1
+            end = position + len(word)
+            if SCORING_MATCHER.word_boundary and (
+                (position > 0 and _is_word_char(corpus[position - 1]))
+                or (end < len(corpus) and _is_word_char(corpus[end]))
+            ):
+                # Only part of a longer word here; keep looking in this text
+                position = corpus.find(word, position + 1)
+                continue
+            rows.append(row)
+            terms.append(TERM_INDEX[word])
+            position = corpus.find(word, starts[row + 1])
+    return np.asarray(rows, dtype=np.int64), np.asarray(terms, dtype=np.int64)
+
+
+def document_terms(texts):
+    """CSR ``(indptr, indices)`` of the distinct keywords found in each text"""
+    word_rows, word_terms = _word_pairs(texts)
+    phrase_rows, phrase_terms = _phrase_pairs(texts)
+    pairs = np.unique(np.concatenate((
+        word_rows * len(TERMS) + word_terms,
+        phrase_rows * len(TERMS) + phrase_terms,
+    )))
+    rows, indices = np.divmod(pairs, len(TERMS))
+    indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(texts)), out=indptr[1:])
+    return indptr, indices
+
+
+def document_term_matrix(texts):
+    """Sparse (SciPy CSR) keyword-presence matrix, one row per text"""
+    if sparse is None:
+        raise ImportError("document_term_matrix needs scipy; score_texts works without it")
+    indptr, indices = document_terms(texts)
+    data = np.ones(len(indices), dtype=np.int64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(texts), len(TERMS)))
+
+
+def _category_matrix(texts):
+    if sparse is not None:
+        return np.asarray(document_term_matrix(texts) @ TERM_WEIGHTS)
+
+    # Sum each document's rows of the weight matrix (empty documents score 0)
+    indptr, indices = document_terms(texts)
+    scores = np.zeros((len(texts), len(CATEGORIES)), dtype=np.int64)
+    nonempty = np.flatnonzero(np.diff(indptr))
+    if len(nonempty):
+        scores[nonempty] = np.add.reduceat(TERM_WEIGHTS[indices], indptr[nonempty], axis=0)
+    return scores
+
+
+def score_texts(texts, chunk_size=10000, workers=1):
+    """Per-category scores for many assessment texts, as arrays.
+
+    Trait categories hold ``analyze_with_keywords`` scores; ``aggressive`` and
+    ``concerning`` hold hit counts, and ``aggressive_score`` combines them as
+    ``analyze_personality_traits`` does before any AI adjustment. Chunks are
+    scored in ``workers`` processes when more than one is given.
+    """
+    texts = list(texts)
+    batches = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_category_matrix, batches))
+    else:
+        chunks = [_category_matrix(batch) for batch in batches]
+    matrix = np.vstack(chunks) if chunks else np.zeros((0, len(CATEGORIES)), dtype=np.int64)
+    scores = {category: matrix[:, column] for column, category in enumerate(CATEGORIES)}
+    scores["aggressive_score"] = 2 * scores["aggressive"] + 3 * scores["concerning"]
+    return scores
+
+
+def score_assessments(assessments, chunk_size=10000, workers=1):
+    """``score_texts`` for lists of responses"""
+    return score_texts((assessment_text(responses) for responses in assessments), chunk_size, workers)
+
+
+def main(argv=None):
+    from bulk_score import iter_records
+
+    parser = argparse.ArgumentParser(description="Keyword category scores for a cohort of stored assessments")
+    parser.add_argument("inputs", nargs="+", help="results/*.json files, directories, .sqlite3 stores, .jsonl files or - for stdin")
+    parser.add_argument("--output", "-o", help="JSONL output path (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Assessments tokenized and scored together")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Worker processes scoring chunks")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    sources, texts = [], []
+    for source, record in iter_records(args.inputs):
+        sources.append(source)
+        texts.append(assessment_text(record.get("responses", [])))
+    scores = score_texts(texts, args.chunk_size, args.workers)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for row, source in enumerate(sources):
+            output.write(json.dumps({
+                "source": source,
+                "scores": {trait: int(scores[trait][row]) for trait in TRAIT_KEYWORDS},
+                "aggressive_score": int(scores["aggressive_score"][row]),
+            }) + "\n")
+    finally:
+        if args.output:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "assessments": len(sources),
+        "sparse_backend": "scipy" if sparse is not None else "numpy",
+        "elapsed_seconds": round(elapsed, 3),
+        "assessments_per_second": round(len(sources) / elapsed, 2) if elapsed else 0.0,
+    }), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
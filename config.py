@@ -67,4 +67,105 @@ UI_STYLES = {
     "warning_color": "#ff7f0e",
     "error_color": "#d62728",
     "info_color": "#17becf"
-}
\ No newline at end of file
+}
+
+# Local model settings
+MODEL_CONFIG = {
+    "generation_model": "gpt2",
+    "generation_backend": "torch",  # "torch" (fp32), "quantized" (dynamic int8) or "onnx" (needs optimum[onnxruntime])
+    "sentiment_model": "distilbert-base-uncased-finetuned-sst-2-english",
+    "eager_load": False,  # Load models in a background thread at startup instead of on first use
+    "warm_up_after_render": True,  # Start the background load once the first page has rendered
+    "load_retry_interval": 60,  # Seconds a model that failed to load is not retried
+}
+
+# Sentiment scoring settings
+SENTIMENT_CONFIG = {
+    "cross_session_batching": True,  # Share forward passes between sessions finishing together
+    "batch_window": 0.05,  # Seconds to wait for other sessions before running a batch
+    "max_batch_size": 32,
+    "max_queue": 256,
+    "timeout": 30,  # Seconds before scoring directly instead of waiting on the batcher
+}
+
+# Text generation settings
+GENERATION_CONFIG = {
+    "max_new_tokens": 100,
+    "temperature": 0.7,
+    "no_repeat_ngram_size": 2,
+    "max_prompt_tokens": 512,
+    "batch_window": 0.03,  # Seconds to gather prompts from concurrent sessions
+    "max_batch_size": 8,
+    "max_queue": 32,  # Pending prompts before falling back to curated responses
+    "timeout": 60,  # Seconds a session waits for its generation
+    "follow_up_max_sentences": 3,  # Streaming stops once the follow-up has this many sentences
+    "follow_up_word_cap": 50,  # ...or this many words
+    "max_streams": 1,  # In-process streams beside the scheduler; further requests are generated whole
+    "prefix_cache": True,  # Reuse the KV-cache of the fixed psychologist prompt prefix (torch backends)
+    "draft_model": None,  # e.g. "distilgpt2": assisted (speculative) decoding, verified by the main model
+}
+
+# Generated response cache settings
+RESPONSE_CACHE_CONFIG = {
+    "enabled": True,
+    "max_entries": 1024,
+    "ttl_seconds": 24 * 3600,
+    "persist_path": None,  # e.g. "results/response_cache.sqlite3" to keep responses across restarts
+}
+
+# Trait scoring settings
+SCORING_CONFIG = {
+    "keyword_word_boundary": False,  # True: keywords only match whole words instead of any substring
+    "traits_cache_entries": 4096,  # Memoized analyses kept in memory
+    "traits_cache_path": None,  # e.g. "results/traits_cache.sqlite3" to keep them across restarts
+    "ai_engine": "generative",  # "generative" (GPT-2 insight pass) or "embedding" (sentence encoder + trait prototypes)
+    "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
+    "embedding_prototypes_path": "results/trait_prototypes.npz",  # Built on first use, or with python embedding_scoring.py
+    "embedding_points": 3,  # Points a trait earns when every response is nearest its prototype
+}
+
+# Async inference client settings (async_client.py)
+ASYNC_CONFIG = {
+    "workers": 4,  # Threads for blocking work (keyword matching, model server calls) awaited by async callers
+}
+
+# Startup budget checked by `python -m benchmarks.import_time`
+STARTUP_CONFIG = {
+    "import_budget_ms": 1500,  # Cold import of personality_app
+    "deferred_modules": ["torch", "transformers", "pandas"],  # Must not be imported at startup
+}
+
+# Results storage settings
+RESULTS_CONFIG = {
+    "store_path": "results/assessments.sqlite3",  # SQLite database (WAL mode) holding completed assessments
+    "writer_queue_size": 256,  # Pending saves before the background writer reports back-pressure
+    "writer_batch_size": 32,  # Saves committed per transaction
+    "writer_flush_interval": 0.2,  # Seconds to wait for more saves before committing a batch
+}
+
+# Hot-path instrumentation settings
+METRICS_CONFIG = {
+    "enabled": True,  # Per-stage timers and counters (cheap enough to leave on)
+    "file_path": None,  # e.g. "results/metrics.prom" to write Prometheus text periodically
+    "file_interval": 15,  # Seconds between metrics file writes
+    "http_port": None,  # e.g. 9108 to serve Prometheus text on http://localhost:9108/metrics
+    "admin_panel": False,  # Show per-stage timings in the sidebar
+}
+
+# Shared model server settings (python model_server.py)
+MODEL_SERVER_CONFIG = {
+    "url": None,  # e.g. "http://127.0.0.1:8765" to send generation and sentiment to a shared model server
+    "host": "127.0.0.1",  # Address the server listens on
+    "port": 8765,
+    "pool_size": 8,  # Keep-alive connections each app process keeps open to the server
+    "timeout": 90,  # Seconds to wait for one server response
+    "retry_interval": 5,  # Seconds to stay on the fallback path after the server was unreachable
+    "fallback_to_local": True,  # Unreachable server: run in-process (True) or use canned responses (False)
+}
+
+# Daily question schedule settings
+QUESTION_SCHEDULE_CONFIG = {
+    "questions_per_day": 8,
+    "days_before": 30,  # Days before today precomputed at startup
+    "days_after": 400,  # Days after today precomputed at startup; later dates are computed on demand
+}
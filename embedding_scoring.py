@@ -0,0 +1,194 @@
+"""Trait scoring from sentence embeddings instead of a GPT-2 text pass.
+
+Each response is embedded once by a small CPU sentence encoder, in a single
+batched forward pass, and compared by cosine similarity against one prototype
+vector per trait. Prototypes are the mean embedding of a few exemplar answers
+for the trait; they are computed once per encoder and kept on disk, so the app
+only ever encodes the user's own responses.
+
+Enable with ``SCORING_CONFIG["ai_engine"] = "embedding"``. Prototypes are built
+on first use, or ahead of time with:
+
+    python embedding_scoring.py --build
+"""
+import argparse
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+
+from config import SCORING_CONFIG
+from lazy import torch, transformers
+from metrics import metrics
+from models import registry
+
+# Characters of each response passed to the encoder
+MAX_RESPONSE_CHARS = 512
+
+# Exemplar answers whose mean embedding is a trait's prototype
+TRAIT_EXEMPLARS = {
+    'Analytical Thinker': [
+        "I break problems down and analyze the data before deciding.",
+        "I like logical, systematic plans and I research every detail.",
+        "I look for evidence and think critically about each option.",
+        "I make a structured list and weigh the pros and cons carefully.",
+    ],
+    'Creative Innovator': [
+        "I love imagining new ideas and experimenting with different approaches.",
+        "I express myself through art, music and writing.",
+        "I enjoy brainstorming original solutions and thinking outside the box.",
+        "Inspiration comes to me when I explore something unfamiliar.",
+    ],
+    'Empathetic Connector': [
+        "I listen to my friends and try to understand how they feel.",
+        "Helping people and supporting my family matters most to me.",
+        "I care deeply about the people around me and value close relationships.",
+        "I notice when someone is upset and I try to comfort them.",
+    ],
+    'Resilient Achiever': [
+        "I set ambitious goals and keep working until I achieve them.",
+        "When I fail I learn from it and try again with more determination.",
+        "I stay focused and disciplined even under pressure.",
+        "Challenges motivate me to push harder and overcome obstacles.",
+    ],
+    'Balanced Pragmatist': [
+        "I try to keep a healthy balance between work and personal time.",
+        "I stay calm, adapt to the situation and choose what is practical.",
+        "I am flexible and consider both logic and feelings when I decide.",
+        "I take things one step at a time and keep a realistic perspective.",
+    ],
+}
+TRAITS = list(TRAIT_EXEMPLARS)
+
+
+def _load_encoder():
+    model_name = SCORING_CONFIG["embedding_model"]
+    tokenizer = transformers.AutoTokenizer.from_pretrained(model_name)
+    model = transformers.AutoModel.from_pretrained(model_name)
+    model.eval()
+    return tokenizer, model
+
+
+def get_encoder():
+    """Return the shared ``(tokenizer, model)`` sentence encoder"""
+    return registry.get("embedding", _load_encoder)
+
+
+def encode(texts):
+    """L2-normalized mean-pooled embeddings, one row per text, from one forward pass"""
+    tokenizer, model = get_encoder()
+    batch = [text[:MAX_RESPONSE_CHARS] for text in texts]
+    metrics.incr("embedded_texts", len(batch))
+    with metrics.timer("embedding_encode"), torch.no_grad():
+        inputs = tokenizer(batch, return_tensors="pt", padding=True, truncation=True)
+        hidden = model(**inputs).last_hidden_state
+        mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+        pooled = torch.nn.functional.normalize(pooled, dim=1)
+    return pooled.cpu().numpy()
+
+
+def prototype_fingerprint():
+    """Identifies prototypes built from the current encoder and exemplars"""
+    payload = json.dumps([SCORING_CONFIG["embedding_model"], TRAIT_EXEMPLARS], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_prototypes():
+    """Trait x dimension matrix of normalized mean exemplar embeddings"""
+    texts = [text for trait in TRAITS for text in TRAIT_EXEMPLARS[trait]]
+    embeddings = encode(texts)
+    prototypes = []
+    start = 0
+    for trait in TRAITS:
+        count = len(TRAIT_EXEMPLARS[trait])
+        vector = embeddings[start:start + count].mean(axis=0)
+        prototypes.append(vector / np.linalg.norm(vector))
+        start += count
+    return np.stack(prototypes).astype(np.float32)
+
+
+def save_prototypes(prototypes, path=None):
+    """Atomically write prototypes with the fingerprint they were built under"""
+    path = path or SCORING_CONFIG["embedding_prototypes_path"]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # np.savez appends .npz to names without it
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, prototypes=prototypes, traits=np.array(TRAITS), fingerprint=prototype_fingerprint())
+    os.replace(tmp_path, path)
+
+
+def load_prototypes(path=None):
+    """Prototypes stored at ``path``, or None when missing or built for other settings"""
+    path = path or SCORING_CONFIG["embedding_prototypes_path"]
+    try:
+        with np.load(path) as stored:
+            if str(stored["fingerprint"]) != prototype_fingerprint() or list(stored["traits"]) != TRAITS:
+                return None
+            return stored["prototypes"]
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        # Missing, truncated or corrupt: rebuilt by the caller
+        return None
+
+
+def _load_or_build_prototypes():
+    prototypes = load_prototypes()
+    if prototypes is None:
+        prototypes = build_prototypes()
+        try:
+            save_prototypes(prototypes)
+        except OSError:
+            # Read-only deployments rebuild them once per process instead
+            pass
+    return prototypes
+
+
+def get_prototypes():
+    """Trait prototypes, read from disk (or built) once per process"""
+    return registry.get("trait_prototypes", _load_or_build_prototypes)
+
+
+def trait_similarities(responses):
+    """Responses x traits cosine similarity matrix"""
+    return encode(responses) @ get_prototypes().T
+
+
+def analyze_with_embeddings(responses):
+    """Trait points from the prototype each response is closest to.
+
+    A trait earns ``embedding_points`` in proportion to the share of responses
+    nearest its prototype, on the same scale as the GPT-2 indicator pass.
+    """
+    texts = [response for response in responses if response.strip()]
+    scores = dict.fromkeys(TRAITS, 0.0)
+    if not texts:
+        return scores
+    with metrics.timer("embedding_scoring"):
+        nearest = trait_similarities(texts).argmax(axis=1)
+    counts = np.bincount(nearest, minlength=len(TRAITS))
+    points = SCORING_CONFIG["embedding_points"]
+    for trait, count in zip(TRAITS, counts):
+        scores[trait] = points * int(count) / len(texts)
+    return scores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the trait prototype vectors for embedding scoring")
+    parser.add_argument("--build", action="store_true", help="Rebuild even if up-to-date prototypes are stored")
+    parser.add_argument("--path", default=SCORING_CONFIG["embedding_prototypes_path"])
+    args = parser.parse_args(argv)
+
+    if not args.build and load_prototypes(args.path) is not None:
+        print(f"Prototypes in {args.path} are up to date")
+        return
+    prototypes = build_prototypes()
+    save_prototypes(prototypes, args.path)
+    print(f"Wrote {prototypes.shape[0]} prototypes ({prototypes.shape[1]} dimensions) to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
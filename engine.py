@@ -0,0 +1,628 @@
+"""Personality analysis engine.
+
+Pure functions with explicit inputs and no Streamlit dependency, so the same
+analysis runs in the app, in thread or process pools and in batch jobs.
+"""
+import hashlib
+import json
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+from assistant import ANALYSIS_SYSTEM_PROMPT, generate_model_response
+from config import SCORING_CONFIG
+from keywords import (
+    AI_INDICATOR_MATCHER,
+    CONCERNING_THEME_MATCHER,
+    SCORING_MATCHER,
+    TRAIT_KEYWORDS,
+    keyword_points,
+)
+from metrics import metrics
+from response_cache import ResponseCache
+from sentiment import score_responses
+
+# Bump whenever a scoring rule changes so memoized analyses are recomputed
+SCORING_VERSION = "1"
+
+# Memoized analyze_personality_traits results, keyed by traits_cache_key()
+traits_cache = ResponseCache(
+    max_entries=SCORING_CONFIG["traits_cache_entries"],
+    persist_path=SCORING_CONFIG["traits_cache_path"],
+)
+metrics.register_collector("traits_cache", traits_cache.stats)
+
+
+@dataclass
+class Report:
+    """Result of a complete personality assessment"""
+    name: str
+    age: str
+    questions: list
+    responses: list
+    traits: dict
+    analysis: str
+    generated_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+    @property
+    def primary_type(self):
+        return self.traits['primary_type']
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def analyze_with_ai(responses, sentiment_results):
+    """Use transformers for personality analysis"""
+    try:
+        # Analyze sentiment patterns
+        positive_count = sum(1 for s in sentiment_results if s['label'] == 'POSITIVE')
+        negative_count = len(sentiment_results) - positive_count
+        total_negative_confidence = sum(s['score'] for s in sentiment_results if s['label'] == 'NEGATIVE')
+        
+        # Combine all responses for analysis
+        full_text = ' '.join(responses).lower()
+        
+        # Initialize personality scores
+        ai_scores = {
+            'Analytical Thinker': 0,
+            'Creative Innovator': 0, 
+            'Empathetic Connector': 0,
+            'Resilient Achiever': 0,
+            'Balanced Pragmatist': 0
+        }
+        
+        # Detect concerning patterns based on sentiment analysis
+        high_negative_responses = [s for s in sentiment_results if s['label'] == 'NEGATIVE' and s['score'] > 0.99]
+        
+        # If we have highly negative responses with concerning content, flag it
+        if len(high_negative_responses) >= 2:
+            # Check for specific concerning themes
+            theme_count = len(CONCERNING_THEME_MATCHER.find(full_text))
+            
+            if theme_count >= 2:
+                # This suggests aggressive/concerning patterns - don't assign normal personality types
+                return {
+                    'Analytical Thinker': 0,
+                    'Creative Innovator': 0,
+                    'Empathetic Connector': 0,
+                    'Resilient Achiever': 0,
+                    'Balanced Pragmatist': 0,
+                    'concerning_pattern_detected': True,
+                    'negative_sentiment_score': total_negative_confidence
+                }
+        
+        # Use AI to generate personality insights for non-concerning responses
+        try:
+            if SCORING_CONFIG["ai_engine"] == "embedding":
+                # One batched encode compared against stored trait prototypes
+                from embedding_scoring import analyze_with_embeddings
+
+                for trait, points in analyze_with_embeddings(responses).items():
+                    ai_scores[trait] += points
+            else:
+                analysis_prompt = f"Analyze these personality responses for traits: {full_text[:500]}..."
+                # Only a real generation is scored; canned fallback text would add random points
+                ai_insight = generate_model_response(analysis_prompt, ANALYSIS_SYSTEM_PROMPT)
+                ai_text = ai_insight.lower()
+                
+                # Analyze AI response for personality indicators
+                for trait, indicators in AI_INDICATOR_MATCHER.match(ai_text).items():
+                    if indicators:
+                        ai_scores[trait] += 3
+        except Exception:
+            # If AI text generation fails, use sentiment-based scoring
+            ai_scores['insight_failed'] = True
+            
+        # Adjust based on sentiment patterns
+        if positive_count > negative_count:
+            ai_scores['Empathetic Connector'] += 1
+            ai_scores['Resilient Achiever'] += 1
+        elif negative_count > positive_count:
+            # More negative responses suggest different patterns
+            ai_scores['Analytical Thinker'] += 1  # Might be critical thinking
+        
+        return ai_scores
+        
+    except Exception as e:
+        return None
+
+def analyze_with_keywords(response_text, keyword_hits=None):
+    """Traditional keyword-based analysis"""
+    # All trait keywords are found in a single pass over the text
+    if keyword_hits is None:
+        with metrics.timer("keywords"):
+            keyword_hits = SCORING_MATCHER.match(response_text)
+    
+    # Score each personality type with weighted scoring
+    return {
+        trait: sum(keyword_points(word) for word in keyword_hits[trait])
+        for trait in TRAIT_KEYWORDS
+    }
+
+def answer_keywords(response):
+    """Sorted scoring keywords in one answer, lowercased as the analysis does"""
+    with metrics.timer("answer_keywords"):
+        return sorted(SCORING_MATCHER.find(response.lower()))
+
+def wants_answer_sentiment(response, use_ai=True):
+    """Whether an answer's features include its sentiment"""
+    return bool(use_ai and response.strip())
+
+def make_answer_features(response, keywords, sentiment=None):
+    """Features of one answer, as aggregated by aggregate_answer_features"""
+    return {'response': response, 'keywords': keywords, 'sentiment': sentiment}
+
+def extract_answer_features(response, use_ai=True):
+    """Sentiment and keyword hits for a single answer"""
+    sentiment = None
+    if wants_answer_sentiment(response, use_ai):
+        try:
+            sentiment = score_responses([response])[0]
+        except Exception:
+            # Left to the full analysis, which falls back to keywords
+            pass
+    return make_answer_features(response, answer_keywords(response), sentiment)
+
+def submit_answer_features(response, use_ai=True):
+    """Start extracting an answer's features in the background; returns a cancellable Future"""
+    from async_client import answer_features, submit
+
+    return submit(answer_features(response, use_ai))
+
+def aggregate_answer_features(responses, answer_features, use_ai=True):
+    """Combine per-answer features into ``(sentiment_results, keyword_hits)``
+
+    Features for an answer that has since changed are recomputed, and with
+    ``use_ai`` every answer still missing sentiment is scored in one batch.
+    Sentiment is None unless every non-empty answer was scored.
+    """
+    features = []
+    for index, response in enumerate(responses):
+        feature = answer_features[index] if index < len(answer_features) else None
+        if feature is None or feature['response'] != response:
+            feature = extract_answer_features(response, use_ai=False)
+        features.append(feature)
+    
+    unscored = [i for i, f in enumerate(features) if f['sentiment'] is None and f['response'].strip()]
+    if use_ai and unscored:
+        try:
+            scored = score_responses([features[i]['response'] for i in unscored])
+            for i, sentiment in zip(unscored, scored):
+                features[i] = dict(features[i], sentiment=sentiment)
+        except Exception:
+            # Left to the full analysis, which falls back to keywords
+            pass
+    
+    with metrics.timer("keywords"):
+        found = SCORING_MATCHER.find_joined(
+            [response.lower() for response in responses],
+            [feature['keywords'] for feature in features],
+        )
+    sentiment_results = [f['sentiment'] for f in features if f['response'].strip()]
+    if any(sentiment is None for sentiment in sentiment_results):
+        sentiment_results = None
+    return sentiment_results, SCORING_MATCHER.group(found)
+
+def traits_cache_key(responses, name, age, use_ai=True):
+    """Content hash identifying one analysis under the current scoring rules"""
+    payload = json.dumps(
+        [SCORING_VERSION, SCORING_CONFIG, list(responses), str(name), str(age), use_ai],
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def analyze_personality_traits(responses, name, age, sentiment_results=None, use_ai=True, keyword_hits=None):
+    """Analyze personality traits based on user responses using AI and keyword analysis
+    
+    Results are memoized by content, so re-analysing the same assessment skips
+    inference and returns an identical result. A keyword-only fallback after
+    the AI pass failed is not memoized, so it is retried. Batch callers can pass
+    precomputed ``sentiment_results`` and ``keyword_hits``, or ``use_ai=False``
+    for keyword-only scoring.
+    """
+    cache_key = traits_cache_key(responses, name, age, use_ai)
+    cached = traits_cache.get(cache_key)
+    if cached is not None:
+        return json.loads(cached)
+    
+    with metrics.timer("analysis"):
+        traits, ai_scored = _analyze_personality_traits(responses, name, age, sentiment_results, use_ai, keyword_hits)
+    if ai_scored or not use_ai:
+        traits_cache.set(cache_key, json.dumps(traits))
+    return traits
+
+def _analyze_personality_traits(responses, name, age, sentiment_results, use_ai, keyword_hits=None):
+    """Uncached analysis behind analyze_personality_traits
+
+    Returns ``(traits, ai_scored)``; ``ai_scored`` is False when AI scoring was
+    requested but failed, or its GPT-2 insight could not be generated.
+    """
+    # Analyze response patterns
+    response_text = ' '.join(responses).lower()
+    
+    # Try AI-powered analysis first
+    ai_personality_score = None
+    if use_ai:
+        try:
+            # Analyze overall sentiment and emotional patterns in one batched pass
+            if sentiment_results is None:
+                sentiment_results = score_responses(responses)
+            
+            # Extract personality insights from AI analysis
+            ai_personality_score = analyze_with_ai(responses, sentiment_results)
+            
+        except Exception as e:
+            # Fallback to keyword analysis if AI fails
+            ai_personality_score = None
+    
+    # Trait, aggressive and concerning keywords are matched in one pass
+    if keyword_hits is None:
+        with metrics.timer("keywords"):
+            keyword_hits = SCORING_MATCHER.match(response_text)
+    
+    # Keyword-based analysis (always runs as backup/validation)
+    keyword_scores = analyze_with_keywords(response_text, keyword_hits)
+    
+    # Enhanced detection for concerning patterns
+    concerning_score = 3 * len(keyword_hits['concerning'])
+    
+    # Combined aggressive scoring
+    aggressive_score = 2 * len(keyword_hits['aggressive']) + concerning_score
+    
+    # Combine AI and keyword analysis if AI is available
+    if ai_personality_score and not ai_personality_score.get('concerning_pattern_detected', False):
+        # Weight AI analysis more heavily but use keywords as validation
+        final_scores = {}
+        for key in keyword_scores:
+            ai_weight = ai_personality_score.get(key, 0) * 0.7
+            keyword_weight = keyword_scores[key] * 0.3
+            final_scores[key] = ai_weight + keyword_weight
+    elif ai_personality_score and ai_personality_score.get('concerning_pattern_detected', False):
+        # AI detected concerning patterns - boost aggressive score significantly
+        final_scores = keyword_scores
+        aggressive_score += 15  # Major boost for AI-detected concerning patterns
+    else:
+        # Use keyword analysis only
+        final_scores = keyword_scores
+    
+    # Get individual scores for later use (convert to integers for list indexing)
+    analytical_score = int(final_scores['Analytical Thinker'])
+    creative_score = int(final_scores['Creative Innovator'])
+    empathetic_score = int(final_scores['Empathetic Connector'])
+    resilient_score = int(final_scores['Resilient Achiever'])
+    balanced_score = int(final_scores['Balanced Pragmatist'])
+    
+    # Determine primary personality type based on scores
+    max_score = max(final_scores.values()) if final_scores.values() else 0
+    
+    # If highly aggressive/concerning responses, create special type with appropriate warning
+    if aggressive_score > 8:  # Much lower threshold for concerning patterns
+        primary_type = {
+            'type': 'High-Intensity Individual',
+            'description': 'Your responses suggest very intense, competitive patterns with focus on dominance and power. This may indicate underlying stress, burnout, or interpersonal challenges that could benefit from professional support.'
+        }
+    elif aggressive_score > 3:
+        primary_type = {
+            'type': 'Intense Competitor',
+            'description': 'You demonstrate high intensity and competitive drive. You approach challenges with strong determination and aren\'t afraid of conflict when pursuing your goals. Consider balancing this drive with empathy and collaboration.'
+        }
+    elif max_score == 0:
+        # If no keywords matched, assign based on response length and complexity
+        avg_length = sum(len(response.split()) for response in responses) / len(responses) if responses else 0
+        if avg_length > 15:
+            primary_type = {
+                'type': 'Thoughtful Reflector',
+                'description': 'You provide detailed, thoughtful responses and take time to consider multiple aspects of situations. You value depth and nuance in your thinking.'
+            }
+        else:
+            primary_type = {
+                'type': 'Balanced Pragmatist',
+                'description': 'You show a well-rounded approach to life, balancing logic and emotion, work and personal time, and individual goals with social connections.'
+            }
+    else:
+        # Get the highest scoring type
+        max_type = max(final_scores, key=final_scores.get)
+        
+        personality_types = {
+            'Analytical Thinker': {
+                'type': 'Analytical Thinker',
+                'description': 'You demonstrate strong analytical capabilities and prefer structured, logical approaches to problem-solving. You value accuracy, detail-oriented work, and evidence-based decision making.'
+            },
+            'Creative Innovator': {
+                'type': 'Creative Innovator', 
+                'description': 'You show high creativity and original thinking. You enjoy exploring new ideas, thinking outside the box, and approaching challenges with innovative solutions.'
+            },
+            'Empathetic Connector': {
+                'type': 'Empathetic Connector',
+                'description': 'You demonstrate strong emotional intelligence and interpersonal skills. You value relationships, show genuine care for others, and excel in collaborative environments.'
+            },
+            'Resilient Achiever': {
+                'type': 'Resilient Achiever',
+                'description': 'You display strong determination and goal-oriented behavior. You persevere through challenges and maintain focus on achieving your objectives.'
+            },
+            'Balanced Pragmatist': {
+                'type': 'Balanced Pragmatist',
+                'description': 'You show a well-rounded approach to life, balancing logic and emotion, work and personal time, and individual goals with social connections.'
+            }
+        }
+        
+        primary_type = personality_types[max_type]
+    
+    # Generate comprehensive traits
+    strengths_options = [
+        "• **Self-Awareness:** You demonstrate excellent understanding of your own thoughts, emotions, and motivations\n• **Emotional Intelligence:** Strong ability to recognize and manage emotions in yourself and others\n• **Adaptability:** You show flexibility in adjusting to new situations and challenges\n• **Communication Skills:** Clear and thoughtful expression of ideas and feelings",
+        
+        "• **Problem-Solving:** You approach challenges with creativity and logical thinking\n• **Resilience:** Strong ability to bounce back from setbacks and maintain optimism\n• **Authenticity:** You present yourself genuinely and value honest self-expression\n• **Growth Mindset:** Open to learning and continuous personal development",
+        
+        "• **Empathy:** You show genuine understanding and care for others' perspectives\n• **Leadership Potential:** Natural ability to guide and inspire others\n• **Analytical Thinking:** Strong capacity for logical reasoning and critical analysis\n• **Stress Management:** Healthy approaches to managing pressure and maintaining balance"
+    ]
+    
+    cognitive_styles = [
+        "You tend to be a **systematic thinker** who prefers structured approaches and careful planning. You value thoroughness and accuracy in your work and decisions.",
+        "You demonstrate **intuitive thinking** combined with analytical skills. You can see both the big picture and important details.",
+        "You show **creative problem-solving** abilities, often thinking of unique solutions and approaches that others might miss.",
+        "You exhibit **balanced cognitive processing**, effectively combining logical analysis with emotional intelligence and intuition."
+    ]
+    
+    emotional_intelligence_options = [
+        "Your responses suggest **high emotional intelligence**. You show good self-awareness, can regulate your emotions effectively, and demonstrate empathy toward others.",
+        "You display **strong emotional awareness** and appear to handle interpersonal relationships with maturity and understanding.",
+        "You demonstrate **balanced emotional processing**, showing both logical thinking and emotional sensitivity in your responses.",
+        "Your emotional intelligence appears **well-developed**, with good self-regulation and social awareness evident in your answers."
+    ]
+    
+    growth_areas_options = [
+        "• **Stress Management:** Continue developing healthy coping strategies for high-pressure situations\n• **Communication:** Work on expressing needs and boundaries more clearly when needed\n• **Work-Life Balance:** Focus on maintaining healthy boundaries between different life areas",
+        
+        "• **Self-Confidence:** Continue building confidence in your abilities and trusting your judgment\n• **Time Management:** Develop more efficient systems for prioritizing tasks and managing time\n• **Assertiveness:** Practice expressing your opinions and needs more directly when appropriate",
+        
+        "• **Patience with Process:** Allow yourself more time for reflection before making important decisions\n• **Self-Care:** Prioritize your own needs alongside caring for others\n• **Flexibility:** Practice adapting to unexpected changes with greater ease"
+    ]
+    
+    # Age-appropriate insights
+    try:
+        age_num = int(age)
+        if age_num < 25:
+            age_insight = f"At {age_num}, you're in an important developmental phase. Your responses show mature self-reflection for your age. This is an excellent time to explore your interests, build skills, and establish healthy patterns that will serve you well throughout life."
+        elif age_num < 35:
+            age_insight = f"At {age_num}, you're likely establishing your career and personal relationships. Your responses suggest good self-awareness as you navigate these important life decisions. Focus on building both professional skills and personal fulfillment."
+        elif age_num < 50:
+            age_insight = f"At {age_num}, you're in a phase where your personality and values are well-established. Your responses show the wisdom that comes with experience. This is often a time for deeper self-understanding and mentoring others."
+        else:
+            age_insight = f"At {age_num}, your responses reflect the depth and wisdom that comes with life experience. You show excellent self-awareness and emotional maturity. Consider how you can share your insights and continue growing."
+    except:
+        age_insight = "Your responses show maturity and thoughtfulness regardless of your age. Continue to embrace growth and self-discovery throughout your life journey."
+    
+    wellness_assessments = [
+        "Your responses suggest **good overall mental wellness**. You appear to have healthy coping mechanisms and a positive outlook. Continue maintaining the practices that support your wellbeing.",
+        
+        "You show **balanced emotional regulation** in your responses. You seem to handle stress reasonably well and have insight into your emotional patterns. Consider continuing to develop your stress management toolkit.",
+        
+        "Your responses indicate **resilient mental health** with good self-awareness. You appear to process emotions effectively and maintain perspective during challenges."
+    ]
+    
+    # Special wellness assessments for concerning patterns
+    concerning_wellness_assessments = [
+        "Your responses show **patterns that may indicate stress, burnout, or underlying emotional challenges**. The focus on dominance, power, and viewing others negatively can be signs of deeper issues. Consider speaking with a mental health professional for support.",
+        
+        "Your responses suggest **high levels of interpersonal tension and competitive stress**. This intensity may be impacting your relationships and overall wellbeing. Professional counseling could help you develop healthier coping strategies.",
+        
+        "Your responses indicate **concerning patterns in how you view others and relationships**. These patterns may be affecting your mental health and social connections. Consider seeking professional support to explore these feelings."
+    ]
+    
+    development_recommendations = [
+        "• Set aside regular time for self-reflection and journaling\n• Read books or take courses in areas that interest you\n• Practice mindfulness or meditation to enhance self-awareness\n• Seek feedback from trusted friends or mentors",
+        
+        "• Challenge yourself with new learning opportunities\n• Practice setting and achieving small, meaningful goals\n• Develop a growth mindset by viewing challenges as opportunities\n• Consider working with a coach or mentor for guidance",
+        
+        "• Engage in activities that build your strengths\n• Practice stepping outside your comfort zone regularly\n• Focus on developing emotional intelligence through practice\n• Create systems for tracking your personal growth"
+    ]
+    
+    social_recommendations = [
+        "• Maintain meaningful connections with family and friends\n• Practice active listening in your relationships\n• Be open about your needs and boundaries\n• Seek relationships that support your authentic self",
+        
+        "• Join groups or communities aligned with your interests\n• Practice empathy and understanding in difficult conversations\n• Work on building trust through consistent, reliable behavior\n• Balance social time with personal reflection time"
+    ]
+    
+    career_recommendations = [
+        "• Align your work with your values and strengths\n• Seek opportunities for continuous learning and growth\n• Build positive relationships with colleagues and supervisors\n• Consider how your personality traits can contribute to your professional success",
+        
+        "• Look for roles that challenge you while playing to your strengths\n• Develop both technical skills and emotional intelligence\n• Practice clear communication and collaboration\n• Set career goals that reflect your personal values"
+    ]
+    
+    wellness_recommendations = [
+        "• Maintain regular exercise and healthy eating habits\n• Practice stress management techniques like deep breathing or meditation\n• Ensure adequate sleep and rest\n• Engage in activities that bring you joy and relaxation",
+        
+        "• Create healthy boundaries between work and personal time\n• Develop a support network of trusted friends and family\n• Practice gratitude and positive thinking\n• Don't hesitate to seek professional help when needed"
+    ]
+    
+    dimensions_data = [
+        "| **Emotional Stability** | High | You handle stress well and maintain emotional balance |",
+        "| **Openness to Experience** | High | You're curious and open to new ideas and experiences |", 
+        "| **Social Orientation** | Balanced | You enjoy both social interaction and personal time |",
+        "| **Conscientiousness** | High | You're organized and responsible in your approach |",
+        "| **Agreeableness** | High | You work well with others and show empathy |"
+    ]
+    
+    future_paths = [
+        f"As you continue to grow, {name}, focus on leveraging your natural strengths while gently working on areas for development. Your personality profile suggests you have excellent potential for both personal fulfillment and positive impact on others. Consider setting goals that align with your values and allow you to use your unique combination of traits.",
+        
+        f"Your personality development journey, {name}, should focus on authentic self-expression and meaningful connections. You have the foundation for continued growth in emotional intelligence, resilience, and personal effectiveness. Trust your instincts while remaining open to new perspectives and experiences."
+    ]
+    
+    # Seed from the answers so the same assessment always gets the same table
+    rng = random.Random(hashlib.sha256(response_text.encode("utf-8")).hexdigest())
+    
+    # Choose appropriate strengths based on personality type
+    if primary_type['type'] == 'Intense Competitor':
+        chosen_strengths = strengths_options[1]  # Problem-solving and resilience focused
+    elif aggressive_score > 0:
+        chosen_strengths = strengths_options[1]  # Resilience and growth focused
+    else:
+        chosen_strengths = strengths_options[analytical_score % len(strengths_options)]
+    
+    # Choose cognitive style based on type
+    if primary_type['type'] == 'Analytical Thinker':
+        chosen_cognitive = cognitive_styles[0]
+    elif primary_type['type'] == 'Creative Innovator':
+        chosen_cognitive = cognitive_styles[2]
+    elif primary_type['type'] == 'Balanced Pragmatist':
+        chosen_cognitive = cognitive_styles[3]
+    else:
+        chosen_cognitive = cognitive_styles[1]
+    
+    traits = {
+        'primary_type': primary_type['type'],
+        'type_description': primary_type['description'],
+        'strengths': chosen_strengths,
+        'cognitive_style': chosen_cognitive,
+        'emotional_intelligence': emotional_intelligence_options[empathetic_score % len(emotional_intelligence_options)],
+        'growth_areas': growth_areas_options[resilient_score % len(growth_areas_options)],
+        'age_insights': age_insight,
+        'wellness_assessment': concerning_wellness_assessments[0] if aggressive_score > 8 else wellness_assessments[balanced_score % len(wellness_assessments)],
+        'development_recommendations': development_recommendations[creative_score % len(development_recommendations)],
+        'social_recommendations': social_recommendations[empathetic_score % len(social_recommendations)],
+        'career_recommendations': career_recommendations[analytical_score % len(career_recommendations)],
+        'wellness_recommendations': wellness_recommendations[balanced_score % len(wellness_recommendations)],
+        'dimensions_table': '\n'.join(rng.sample(dimensions_data, 4)),
+        'future_path': future_paths[resilient_score % len(future_paths)]
+    }
+    ai_scored = ai_personality_score is not None and not ai_personality_score.get('insight_failed', False)
+    return traits, ai_scored
+
+def generate_personality_diagnosis(responses, name, age, traits=None):
+    """Generate comprehensive personality diagnosis"""
+    # Analyze key personality dimensions based on responses
+    if traits is None:
+        traits = analyze_personality_traits(responses, name, age)
+    
+    # Generate comprehensive analysis
+    analysis = f"""# 🧠 Comprehensive Personality Analysis for {name}
+
+## 👤 **Personal Profile**
+**Name:** {name}  
+**Age:** {age}  
+**Assessment Date:** {datetime.now().strftime('%B %d, %Y')}  
+**Assessment Type:** AI-Powered Personality Analysis
+
+---
+
+## 🎯 **Personality Type Assessment**
+
+Based on your responses, {name}, your personality profile suggests you exhibit characteristics aligned with:
+
+**Primary Personality Type:** {traits['primary_type']}
+
+{traits['type_description']}
+
+---
+
+## 💪 **Key Strengths & Positive Traits**
+
+Your responses reveal several notable strengths:
+
+### 🌟 **Core Strengths:**
+{traits['strengths']}
+
+### 🧩 **Cognitive Style:**
+{traits['cognitive_style']}
+
+### 💖 **Emotional Intelligence:**
+{traits['emotional_intelligence']}
+
+---
+
+## 🌱 **Areas for Personal Growth**
+
+Every personality has areas that can benefit from development. For you, {name}, consider focusing on:
+
+{traits['growth_areas']}
+
+---
+
+## 🎂 **Age-Appropriate Insights (Age {age})**
+
+{traits['age_insights']}
+
+---
+
+## 🧘 **Mental Wellness & Stress Management**
+
+{traits['wellness_assessment']}
+
+---
+
+## 🎯 **Personalized Recommendations**
+
+Based on your unique personality profile, here are tailored suggestions:
+
+### 📚 **Personal Development:**
+{traits['development_recommendations']}
+
+### 🤝 **Relationship & Social Life:**
+{traits['social_recommendations']}
+
+### 💼 **Career & Goals:**
+{traits['career_recommendations']}
+
+### 🧘‍♀️ **Self-Care & Wellness:**
+{traits['wellness_recommendations']}
+
+---
+
+## 📊 **Personality Dimensions Summary**
+
+| Dimension | Your Profile | Description |
+|-----------|-------------|-------------|
+{traits['dimensions_table']}
+
+---
+
+## 🔮 **Future Development Path**
+
+{traits['future_path']}
+
+---
+
+## ⚠️ **Important Disclaimer**
+
+This personality assessment is designed for self-reflection and personal growth purposes. It is **not a clinical diagnosis** and should not replace professional psychological consultation when needed. 
+
+If you're experiencing persistent mental health concerns, please consider speaking with a qualified mental health professional.
+
+---
+
+## 🎉 **Celebrating Your Unique Personality**
+
+{name}, your personality is a beautiful combination of traits that make you uniquely you. Embrace your strengths, work on your growth areas with patience and self-compassion, and remember that personality development is a lifelong journey.
+
+**Assessment completed with care by AI Personality Analysis System**  
+*Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}*
+"""
+    
+    return analysis
+
+
+def assess(name, age, responses, questions, sentiment_results=None, use_ai=True, answer_features=None):
+    """Analyse one assessment and render its diagnosis
+
+    ``answer_features`` from ``extract_answer_features`` (one per response)
+    let the analysis aggregate work already done as each answer was submitted.
+    """
+    keyword_hits = None
+    if answer_features is not None:
+        sentiment_results, keyword_hits = aggregate_answer_features(responses, answer_features, use_ai)
+    traits = analyze_personality_traits(
+        responses, name, age, sentiment_results=sentiment_results, use_ai=use_ai, keyword_hits=keyword_hits,
+    )
+    with metrics.timer("diagnosis"):
+        analysis = generate_personality_diagnosis(responses, name, age, traits)
+    return Report(
+        name=name,
+        age=age,
+        questions=list(questions),
+        responses=list(responses),
+        traits=traits,
+        analysis=analysis,
+    )
@@ -0,0 +1,318 @@
+"""GPT-2 text generation behind a micro-batching request queue.
+
+Every session thread hands its prompt to one scheduler, which gathers prompts
+arriving within a short window and runs them as a single padded ``generate``
+call. Only the scheduler thread touches the model, so concurrent sessions no
+longer compete with separate torch thread pools.
+
+Prompts starting with a registered fixed prefix (the psychologist system
+prompt and instructions) reuse that prefix's KV-cache, computed once per
+model, so only the per-answer suffix is prefilled. With a ``draft_model``
+configured, single prompts use assisted (speculative) decoding instead: the
+draft proposes several tokens that GPT-2 verifies in one forward pass.
+"""
+import copy
+import threading
+import time
+import weakref
+
+from batching import MicroBatcher, QueueFullError
+from config import GENERATION_CONFIG, MODEL_CONFIG
+from lazy import torch, transformers
+from metrics import metrics
+from model_server import call_with_fallback, get_model_server_client
+from models import get_draft_model, get_generation_model
+
+_prompt_prefixes = []
+# model -> {prefix: (prefix token ids, KV-cache, prefill seconds)}
+_prefix_caches = weakref.WeakKeyDictionary()
+_prefix_lock = threading.Lock()
+_draft_failed = False
+# In-process streams running beside the batching scheduler
+_stream_slots = threading.BoundedSemaphore(GENERATION_CONFIG["max_streams"])
+
+
+def register_prompt_prefix(prefix):
+    """Mark ``prefix`` as shared by many prompts so its KV-cache is computed once"""
+    with _prefix_lock:
+        if prefix not in _prompt_prefixes:
+            _prompt_prefixes.append(prefix)
+            # Longest first, so the most specific registered prefix wins
+            _prompt_prefixes.sort(key=len, reverse=True)
+
+
+def prefix_cache_enabled():
+    # ONNX Runtime models keep their own cache format; DynamicCache needs transformers 4.36+
+    return (
+        GENERATION_CONFIG["prefix_cache"]
+        and MODEL_CONFIG["generation_backend"] != "onnx"
+        and hasattr(transformers, "DynamicCache")
+    )
+
+
+def _prefix_entry(tokenizer, model, prefix):
+    caches = _prefix_caches.get(model)
+    entry = caches.get(prefix) if caches is not None else None
+    if entry is not None:
+        return entry
+
+    with _prefix_lock:
+        caches = _prefix_caches.setdefault(model, {})
+        entry = caches.get(prefix)
+        if entry is None:
+            prefix_ids = tokenizer(prefix, return_tensors="pt")["input_ids"]
+            start = time.perf_counter()
+            with metrics.timer("prefix_prefill"), torch.no_grad():
+                cache = model(prefix_ids, past_key_values=transformers.DynamicCache(), use_cache=True).past_key_values
+            entry = caches[prefix] = (prefix_ids[0].tolist(), cache, time.perf_counter() - start)
+    return entry
+
+
+def prefix_cache_kwargs(tokenizer, model, prompt, input_ids):
+    """``generate`` kwargs reusing a registered prefix's KV-cache for one prompt.
+
+    Empty when no registered prefix applies, or when the prompt's tokens do
+    not start with the prefix's own tokens (a BPE merge across the boundary).
+    """
+    if not prefix_cache_enabled() or input_ids.shape[0] != 1:
+        return {}
+    prefix = next((prefix for prefix in _prompt_prefixes if prompt.startswith(prefix)), None)
+    if prefix is None:
+        return {}
+
+    prefix_ids, cache, prefill_seconds = _prefix_entry(tokenizer, model, prefix)
+    if input_ids.shape[1] <= len(prefix_ids) or input_ids[0, :len(prefix_ids)].tolist() != prefix_ids:
+        metrics.incr("prefix_cache_mismatches")
+        return {}
+
+    metrics.incr("prefix_cache_hits")
+    metrics.incr("prefix_tokens_reused", len(prefix_ids))
+    # Prefill time the cached prefix spared this call
+    metrics.incr("prefix_prefill_saved_seconds", prefill_seconds)
+    # generate() appends to the cache it is given, so every call gets its own copy
+    return {"past_key_values": copy.deepcopy(cache)}
+
+
+def assisted_decoding_kwargs(batch_size):
+    """``generate`` kwargs for speculative decoding with the draft model, when configured.
+
+    Transformers only supports assisted generation one sequence at a time.
+    Sampling through it keeps the main model's output distribution.
+    """
+    global _draft_failed
+    if (
+        not GENERATION_CONFIG["draft_model"]
+        or _draft_failed
+        or batch_size != 1
+        or MODEL_CONFIG["generation_backend"] == "onnx"
+    ):
+        return {}
+    try:
+        draft = get_draft_model()
+    except Exception:
+        # Not retried on every call; plain decoding still works
+        _draft_failed = True
+        metrics.incr("draft_model_unavailable")
+        return {}
+    metrics.incr("assisted_generations")
+    return {"assistant_model": draft}
+
+
+def decoding_kwargs(tokenizer, model, prompt, input_ids):
+    # Assisted decoding keeps its own caches for both models, so it replaces prefix reuse
+    return assisted_decoding_kwargs(input_ids.shape[0]) or prefix_cache_kwargs(tokenizer, model, prompt, input_ids)
+
+
+def generation_params(**overrides):
+    """Hashable generation parameters, defaulting to GENERATION_CONFIG"""
+    params = {
+        "max_new_tokens": GENERATION_CONFIG["max_new_tokens"],
+        "temperature": GENERATION_CONFIG["temperature"],
+        "do_sample": True,
+        "no_repeat_ngram_size": GENERATION_CONFIG["no_repeat_ngram_size"],
+    }
+    params.update(overrides)
+    return tuple(sorted(params.items()))
+
+
+def generate_batch(prompts, params=None):
+    """Generate continuations for several prompts in one padded forward pass"""
+    tokenizer, model = get_generation_model()
+    params = dict(params or generation_params())
+
+    with metrics.timer("tokenize"):
+        inputs = tokenizer(
+            prompts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=GENERATION_CONFIG["max_prompt_tokens"],
+        )
+
+    metrics.incr("generate_batches")
+    metrics.incr("generated_prompts", len(prompts))
+    # Batches of several prompts are left-padded, so only lone prompts get these
+    cache_kwargs = decoding_kwargs(tokenizer, model, prompts[0], inputs["input_ids"])
+    with metrics.timer("generate"), torch.no_grad():
+        outputs = model.generate(
+            inputs["input_ids"],
+            attention_mask=inputs["attention_mask"],
+            num_return_sequences=1,
+            pad_token_id=tokenizer.eos_token_id,
+            **cache_kwargs,
+            **params
+        )
+
+    # Prompts are left-padded, so every continuation starts at the same offset
+    prompt_length = inputs["input_ids"].shape[1]
+    return [
+        tokenizer.decode(sequence[prompt_length:], skip_special_tokens=True).strip()
+        for sequence in outputs
+    ]
+
+
+def _process_requests(requests):
+    """Run queued ``(prompt, params)`` requests, one generate call per parameter set"""
+    groups = {}
+    for index, (prompt, params) in enumerate(requests):
+        groups.setdefault(params, []).append(index)
+
+    results = [None] * len(requests)
+    for params, indices in groups.items():
+        texts = generate_batch([requests[i][0] for i in indices], params)
+        for i, text in zip(indices, texts):
+            results[i] = text
+    return results
+
+
+scheduler = MicroBatcher(
+    _process_requests,
+    max_batch_size=GENERATION_CONFIG["max_batch_size"],
+    max_wait=GENERATION_CONFIG["batch_window"],
+    max_queue=GENERATION_CONFIG["max_queue"],
+    name="generation-scheduler",
+)
+
+
+def generate(prompt, params=None, timeout=None):
+    """Generate a continuation on the shared model server, or in-process.
+
+    Raises ``QueueFullError`` when the scheduler is saturated and
+    ``TimeoutError`` when no result arrives within ``timeout`` seconds.
+    """
+    if params is None:
+        params = generation_params()
+    return call_with_fallback(
+        lambda client: client.generate(prompt, params),
+        lambda: generate_local(prompt, params, timeout),
+    )
+
+
+def generate_local(prompt, params=None, timeout=None):
+    """Queue a prompt for in-process batched generation and wait for its continuation"""
+    if params is None:
+        params = generation_params()
+    if timeout is None:
+        timeout = GENERATION_CONFIG["timeout"]
+    return scheduler.submit((prompt, params), timeout=timeout)
+
+
+def submit_local(prompt, params=None):
+    """Queue a prompt for in-process batched generation; returns a Future of its continuation"""
+    if params is None:
+        params = generation_params()
+    return scheduler.submit_futures([(prompt, params)])[0]
+
+
+def follow_up_complete(text, max_sentences=None, word_cap=None):
+    """True once post-processing would discard anything generated after ``text``"""
+    if max_sentences is None:
+        max_sentences = GENERATION_CONFIG["follow_up_max_sentences"]
+    if word_cap is None:
+        word_cap = GENERATION_CONFIG["follow_up_word_cap"]
+
+    # Follow-ups are cut at the first question mark
+    if "?" in text:
+        return True
+    if text.count(".") >= max_sentences:
+        return True
+    return len(text.split()) >= word_cap
+
+
+def stream_generate(prompt, params=None, stop=None):
+    """Yield decoded text chunks as GPT-2 produces them.
+
+    ``stop`` receives the text generated so far and ends generation as soon as
+    it returns True. Streaming requests bypass the batching scheduler so the
+    first tokens reach the caller without waiting for a batch to fill.
+
+    With a model server configured, or once ``max_streams`` streams are running
+    in-process, the continuation is generated whole by ``generate`` (remotely,
+    or through the scheduler) and yielded as a single chunk.
+    """
+    if params is None:
+        params = generation_params()
+    if get_model_server_client() is not None or not _stream_slots.acquire(blocking=False):
+        metrics.incr("streams_generated_whole")
+        yield generate(prompt, params)
+        return
+    try:
+        yield from _stream_local(prompt, params, stop)
+    finally:
+        _stream_slots.release()
+
+
+def _stream_local(prompt, params, stop):
+    tokenizer, model = get_generation_model()
+    params = dict(params)
+    with metrics.timer("tokenize"):
+        inputs = tokenizer(
+            prompt,
+            return_tensors="pt",
+            truncation=True,
+            max_length=GENERATION_CONFIG["max_prompt_tokens"],
+        )
+    prompt_length = inputs["input_ids"].shape[1]
+    cache_kwargs = decoding_kwargs(tokenizer, model, prompt, inputs["input_ids"])
+    streamer = transformers.TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+
+    # Set when the consumer stops reading, so an abandoned stream stops generating
+    cancelled = threading.Event()
+
+    class _StopWhen(transformers.StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            done = cancelled.is_set()
+            if not done and stop is not None:
+                done = stop(tokenizer.decode(input_ids[0, prompt_length:], skip_special_tokens=True))
+            return torch.full((input_ids.shape[0],), done, dtype=torch.bool)
+
+    errors = []
+
+    def _run():
+        metrics.incr("stream_generations")
+        try:
+            with metrics.timer("stream_generate"), torch.no_grad():
+                model.generate(
+                    inputs["input_ids"],
+                    attention_mask=inputs["attention_mask"],
+                    pad_token_id=tokenizer.eos_token_id,
+                    streamer=streamer,
+                    stopping_criteria=transformers.StoppingCriteriaList([_StopWhen()]),
+                    **cache_kwargs,
+                    **params
+                )
+        except Exception as e:
+            errors.append(e)
+            # Unblock the consumer loop below
+            streamer.end()
+
+    thread = threading.Thread(target=_run, name="stream-generate", daemon=True)
+    thread.start()
+    try:
+        for chunk in streamer:
+            yield chunk
+    finally:
+        cancelled.set()
+    thread.join()
+    if errors:
+        raise errors[0]
@@ -0,0 +1,176 @@
+"""Keyword lists and a precompiled multi-pattern matcher for scoring.
+
+Every keyword list used for scoring is compiled once at import time into a
+single trie-shaped regular expression, so one pass over a text reports the hits
+for all categories instead of one substring scan per keyword.
+"""
+import re
+
+from config import SCORING_CONFIG
+
+# Trait keywords used by analyze_with_keywords
+TRAIT_KEYWORDS = {
+    'Analytical Thinker': ['analysis', 'analyze', 'logical', 'logic', 'systematic', 'methodical', 'structured', 'organized', 'planning', 'research', 'data', 'facts', 'evidence', 'rational', 'objective'],
+    'Creative Innovator': ['creative', 'creativity', 'artistic', 'imaginative', 'innovative', 'original', 'unique', 'inspiration', 'design', 'experiment', 'brainstorm', 'invent', 'express', 'aesthetic'],
+    'Empathetic Connector': ['empathy', 'compassion', 'caring', 'supportive', 'understanding', 'listening', 'emotional', 'relationships', 'connect', 'help others', 'teamwork', 'collaborate'],
+    'Resilient Achiever': ['challenge', 'overcome', 'persist', 'persevere', 'determined', 'resilient', 'strong', 'achieve', 'goals', 'success', 'push through', 'never give up', 'endure'],
+    'Balanced Pragmatist': ['balance', 'moderate', 'flexible', 'adaptable', 'practical', 'reasonable', 'compromise', 'adjust', 'consider both', 'depends on', 'varies'],
+}
+
+AGGRESSIVE_KEYWORDS = ['angry', 'hate', 'fight', 'argue', 'aggressive', 'intense', 'furious', 'rage', 'conflict', 'confrontation', 'competitive', 'destroy', 'dominate', 'weakness', 'weak', 'pathetic', 'power', 'powerful', 'superior', 'ignore', 'worthless', 'useless', 'inferior', 'crush', 'defeat', 'control', 'manipulate', 'exploit', 'domination', 'fail', 'failure', 'failing']
+
+# Enhanced detection for concerning patterns
+CONCERNING_PATTERNS = ['weakness in others', 'weak around me', 'pathetic weakness', 'focus on my own power', 'showing my power', 'become the best', 'higher than others', 'see other people fail', 'see failure in people', 'makes me feel powerful', 'grow my power', 'my responsibilities and power']
+
+# Themes that, with strongly negative sentiment, suggest aggressive patterns
+CONCERNING_THEMES = ['fail', 'failure', 'power', 'powerful', 'weak', 'weakness']
+
+# Personality indicators looked for in generated analysis text
+AI_TRAIT_INDICATORS = {
+    'Analytical Thinker': ['logical', 'analytical', 'systematic', 'structured'],
+    'Creative Innovator': ['creative', 'innovative', 'imaginative', 'original'],
+    'Empathetic Connector': ['empathetic', 'caring', 'supportive', 'emotional'],
+    'Resilient Achiever': ['resilient', 'determined', 'strong', 'persistent'],
+    'Balanced Pragmatist': ['balanced', 'practical', 'moderate', 'flexible'],
+}
+
+# Categories for curated fallback responses, in priority order
+FALLBACK_CATEGORIES = {
+    'stress': ['stress', 'pressure', 'overwhelm', 'anxious', 'worried'],
+    'decision': ['decision', 'choose', 'decide', 'choice', 'option'],
+    'conflict': ['conflict', 'disagree', 'argument', 'fight', 'dispute'],
+    'growth': ['grow', 'learn', 'improve', 'develop', 'change', 'better'],
+}
+
+# Categories for short-answer follow-up questions, in priority order
+FOLLOW_UP_CATEGORIES = {
+    'stress': ['stress', 'pressure', 'overwhelm'],
+    'decision': ['decision', 'choose', 'decide'],
+    'social': ['social', 'people', 'friend', 'party'],
+    'challenge': ['challenge', 'difficult', 'problem'],
+    'goals': ['goal', 'ambition', 'future', 'plan'],
+}
+
+
+def _trie_pattern(words):
+    """Regex alternation shaped like a trie, preferring the longest keyword"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional group: try the longer keyword before stopping here
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Finds which keywords of several categories occur in a text in one pass.
+
+    Matching keeps the substring semantics of ``keyword in text``. With
+    ``word_boundary=True`` keywords only match as whole words or phrases.
+    """
+
+    def __init__(self, categories, word_boundary=False):
+        self.categories = {name: list(words) for name, words in categories.items()}
+        self.word_boundary = word_boundary
+
+        self._keyword_categories = {}
+        for name, words in self.categories.items():
+            for word in words:
+                self._keyword_categories.setdefault(word, []).append(name)
+        keywords = list(self._keyword_categories)
+        self._max_length = max(map(len, keywords), default=0)
+
+        # Shorter keywords that start a longer one match at the same position
+        self._prefixes = {
+            word: [other for other in keywords if word.startswith(other)]
+            for word in keywords
+        }
+
+        body = _trie_pattern(keywords)
+        if word_boundary:
+            body = r'\b(' + body + r')\b'
+        else:
+            body = '(' + body + ')'
+        # Zero-width lookahead so overlapping keywords are all found
+        self._pattern = re.compile('(?=' + body + ')')
+
+    def _ends_word(self, text, end):
+        return end == len(text) or not (text[end].isalnum() or text[end] == '_')
+
+    def find(self, text):
+        """Set of keywords occurring in ``text``"""
+        found = set()
+        for match in self._pattern.finditer(text):
+            longest = match.group(1)
+            if longest in found and not self.word_boundary:
+                continue
+            start = match.start()
+            for word in self._prefixes[longest]:
+                if not self.word_boundary or self._ends_word(text, start + len(word)):
+                    found.add(word)
+        return found
+
+    def find_joined(self, parts, part_hits, sep=' '):
+        """Keywords in ``sep.join(parts)``, given ``find()`` for each part.
+
+        Keywords inside a part are taken from ``part_hits``; only the text around
+        each separator is searched, for keywords spanning two parts.
+        """
+        joined = sep.join(parts)
+        if self.word_boundary:
+            # A window edge would look like a word boundary; search the whole text
+            return self.find(joined)
+        found = set().union(*part_hits)
+        width = self._max_length - 1
+        offset = 0
+        for part in parts[:-1]:
+            offset += len(part)
+            window = joined[max(0, offset - width):offset + len(sep) + width]
+            found |= self.find(window)
+            offset += len(sep)
+        return found
+
+    def group(self, found):
+        """Found keywords for every category, in the category's keyword order"""
+        return {
+            name: [word for word in words if word in found]
+            for name, words in self.categories.items()
+        }
+
+    def match(self, text):
+        """Matched keywords for every category, in the category's keyword order"""
+        return self.group(self.find(text))
+
+    def first_category(self, text, default=None):
+        """First category (in definition order) with at least one hit"""
+        found = self.find(text)
+        for name, words in self.categories.items():
+            if any(word in found for word in words):
+                return name
+        return default
+
+
+# Scoring matcher shared by analyze_with_keywords and analyze_personality_traits
+SCORING_MATCHER = KeywordMatcher(
+    dict(TRAIT_KEYWORDS, aggressive=AGGRESSIVE_KEYWORDS, concerning=CONCERNING_PATTERNS),
+    word_boundary=SCORING_CONFIG["keyword_word_boundary"],
+)
+CONCERNING_THEME_MATCHER = KeywordMatcher({'themes': CONCERNING_THEMES})
+AI_INDICATOR_MATCHER = KeywordMatcher(AI_TRAIT_INDICATORS)
+FALLBACK_MATCHER = KeywordMatcher(FALLBACK_CATEGORIES)
+FOLLOW_UP_MATCHER = KeywordMatcher(FOLLOW_UP_CATEGORIES)
+
+
+def keyword_points(word):
+    """Longer, more specific keywords count double"""
+    return 2 if len(word) > 6 else 1
@@ -0,0 +1,52 @@
+"""Deferred imports for heavy optional dependencies.
+
+``pd = LazyModule("pandas")`` reads like a normal module alias, but the import
+only happens the first time an attribute is used, so modules that merely
+reference pandas, torch or transformers stay cheap to import.
+"""
+import importlib
+import threading
+import time
+
+# Seconds spent importing each lazily loaded module
+IMPORT_TIMES = {}
+
+_import_lock = threading.Lock()
+
+
+class LazyModule:
+    """Module proxy that imports ``name`` on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with _import_lock:
+                module = self.__dict__["_module"]
+                if module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    IMPORT_TIMES.setdefault(self._name, round(time.perf_counter() - start, 3))
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def is_loaded(self):
+        return self.__dict__["_module"] is not None
+
+    def __repr__(self):
+        state = "loaded" if self.is_loaded() else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+torch = LazyModule("torch")
+transformers = LazyModule("transformers")
+pandas = LazyModule("pandas")
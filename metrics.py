@@ -0,0 +1,203 @@
+"""Always-on timers and counters for the app's hot paths.
+
+Stages (model load, tokenization, generation, sentiment, keyword scoring,
+diagnosis rendering, persistence) are timed into histograms shared by every
+session in the process. ``render()`` returns them in the Prometheus text
+format, which can be written to a file periodically or served over HTTP.
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_CONFIG
+
+PREFIX = "personality"
+
+# Histogram upper bounds in seconds, from keyword scoring to cold model loads
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Metrics:
+    """Thread-safe registry of stage timers, counters and gauges"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, enabled=True):
+        self.buckets = tuple(buckets)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        self._gauges = {}
+        self._collectors = {}
+
+    def observe(self, stage, seconds):
+        """Record one duration for ``stage``"""
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {
+                    "count": 0,
+                    "sum": 0.0,
+                    "max": 0.0,
+                    "buckets": [0] * (len(self.buckets) + 1),
+                }
+            entry["count"] += 1
+            entry["sum"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            entry["buckets"][bisect.bisect_left(self.buckets, seconds)] += 1
+
+    @contextmanager
+    def timer(self, stage):
+        """Time the enclosed block as one observation of ``stage``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def incr(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def register_collector(self, name, collect):
+        """Report the numeric values of ``collect()`` as ``<name>_<key>`` gauges on every read"""
+        with self._lock:
+            self._collectors[name] = collect
+
+    def _collected_gauges(self):
+        with self._lock:
+            gauges = dict(self._gauges)
+            collectors = list(self._collectors.items())
+        # Collectors take their own locks, so they run outside ours
+        for name, collect in collectors:
+            try:
+                values = collect()
+            except Exception:
+                continue
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    gauges[f"{name}_{key}"] = value
+        return gauges
+
+    def snapshot(self):
+        """Plain-dict copy of every metric"""
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": entry["count"],
+                    "sum_seconds": entry["sum"],
+                    "mean_seconds": entry["sum"] / entry["count"] if entry["count"] else 0.0,
+                    "max_seconds": entry["max"],
+                }
+                for stage, entry in self._stages.items()
+            }
+            counters = dict(self._counters)
+        return {"stages": stages, "counters": counters, "gauges": self._collected_gauges()}
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            stages = {stage: dict(entry, buckets=list(entry["buckets"])) for stage, entry in self._stages.items()}
+            counters = dict(self._counters)
+        gauges = self._collected_gauges()
+
+        lines = [
+            f"# HELP {PREFIX}_stage_seconds Time spent in each hot-path stage",
+            f"# TYPE {PREFIX}_stage_seconds histogram",
+        ]
+        for stage in sorted(stages):
+            entry = stages[stage]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), entry["buckets"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{stage}"}} {entry["sum"]:.6f}')
+            lines.append(f'{PREFIX}_stage_seconds_count{{stage="{stage}"}} {entry["count"]}')
+        for name in sorted(counters):
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            lines.append(f"{PREFIX}_{name}_total {counters[name]}")
+        for name in sorted(gauges):
+            lines.append(f"# TYPE {PREFIX}_{name} gauge")
+            lines.append(f"{PREFIX}_{name} {gauges[name]}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+
+metrics = Metrics(enabled=METRICS_CONFIG["enabled"])
+
+
+def write_metrics_file(path=None):
+    """Atomically replace ``path`` with the current Prometheus text"""
+    path = path or METRICS_CONFIG["file_path"]
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(metrics.render())
+    os.replace(tmp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes would otherwise log to stderr every few seconds
+        pass
+
+
+_exporters = {}
+_exporters_lock = threading.Lock()
+
+
+def start_exporters():
+    """Start the configured metrics file writer and HTTP endpoint once per process"""
+    with _exporters_lock:
+        if METRICS_CONFIG["file_path"] and "file" not in _exporters:
+            def _write_forever():
+                while True:
+                    time.sleep(METRICS_CONFIG["file_interval"])
+                    try:
+                        write_metrics_file()
+                    except OSError:
+                        pass
+
+            thread = threading.Thread(target=_write_forever, name="metrics-file", daemon=True)
+            thread.start()
+            _exporters["file"] = thread
+
+        if METRICS_CONFIG["http_port"] and "http" not in _exporters:
+            try:
+                server = ThreadingHTTPServer(("127.0.0.1", METRICS_CONFIG["http_port"]), _MetricsHandler)
+            except OSError:
+                # Port taken, e.g. by another app process on the same host
+                return _exporters
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            _exporters["http"] = server
+    return _exporters
@@ -0,0 +1,262 @@
+"""Optional shared inference server for multi-worker deployments.
+
+Every Streamlit process that runs the models in-process holds its own copy of
+GPT-2 and the sentiment model. Started once per host, this server loads them a
+single time and serves every app process over local HTTP:
+
+    python model_server.py --port 8765
+
+and in config.py: ``MODEL_SERVER_CONFIG["url"] = "http://127.0.0.1:8765"``.
+
+Requests from all workers go through the server's micro-batchers, so sessions
+in different processes share batches too. App processes talk to it through
+``ModelServerClient``, which keeps a pool of keep-alive connections. An
+unreachable server is skipped for ``retry_interval`` seconds; callers then run
+in-process or fall back to canned responses. A server that answers with an
+error is not treated as unreachable: the caller's own fallback applies
+instead of loading the models in every app process.
+"""
+import argparse
+import http.client
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from batching import QueueFullError
+from config import MODEL_SERVER_CONFIG
+from metrics import metrics
+
+
+class ModelServerUnavailable(Exception):
+    """Raised when the model server cannot be reached"""
+
+
+class ModelServerError(Exception):
+    """Raised when the model server answers a request with an error status"""
+
+
+# A pooled keep-alive connection the server already closed fails with one of these
+# before any response arrives; only then is the request safe to send again
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class ModelServerClient:
+    """Thread-safe client with a keep-alive connection pool and health tracking"""
+
+    def __init__(self, url, pool_size=None, timeout=None, retry_interval=None):
+        config = MODEL_SERVER_CONFIG
+        parts = urlsplit(url)
+        self.url = url
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = config["timeout"] if timeout is None else timeout
+        self.retry_interval = config["retry_interval"] if retry_interval is None else retry_interval
+        self._pool = queue.LifoQueue(maxsize=pool_size or config["pool_size"])
+        self._down_until = 0.0
+
+    def _acquire(self, fresh=False):
+        if not fresh:
+            try:
+                return self._pool.get_nowait(), True
+            except queue.Empty:
+                pass
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout), False
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def available(self):
+        """False while the server is considered down"""
+        return time.monotonic() >= self._down_until
+
+    def _mark_down(self):
+        self._down_until = time.monotonic() + self.retry_interval
+        metrics.incr("model_server_unreachable")
+
+    def _request(self, method, path, payload=None):
+        if not self.available():
+            raise ModelServerUnavailable(f"model server at {self.url} is down")
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+
+        connection, reused = self._acquire()
+        try:
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+            except _STALE_CONNECTION_ERRORS:
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; retry once on a new one
+                connection.close()
+                connection, reused = self._acquire(fresh=True)
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            # Includes timeouts, which are never retried: the server may still be working
+            connection.close()
+            self._mark_down()
+            raise ModelServerUnavailable(f"model server at {self.url} unreachable: {e}") from e
+        self._release(connection)
+
+        if response.status == 503:
+            raise QueueFullError(f"model server queue is full ({path})")
+        if response.status != 200:
+            raise ModelServerError(f"model server {path} returned {response.status}: {data[:200]!r}")
+        return json.loads(data)
+
+    def health(self):
+        """Server status and loaded models; raises ModelServerUnavailable"""
+        return self._request("GET", "/health")
+
+    def generate(self, prompt, params):
+        with metrics.timer("model_server_generate"):
+            return self._request("POST", "/generate", {"prompt": prompt, "params": list(params)})["text"]
+
+    def classify(self, texts):
+        with metrics.timer("model_server_sentiment"):
+            return self._request("POST", "/sentiment", {"texts": list(texts)})["results"]
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_client = None
+_client_lock = threading.Lock()
+_serving = False
+
+
+def get_model_server_client():
+    """Process-wide client, or None when no server is configured (or inside the server)"""
+    global _client
+    if not MODEL_SERVER_CONFIG["url"] or _serving:
+        return None
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ModelServerClient(MODEL_SERVER_CONFIG["url"])
+    return _client
+
+
+def call_with_fallback(remote, local):
+    """``remote(client)`` when a server is configured, else (or on failure) ``local()``
+
+    With ``fallback_to_local`` off, a failed server call is re-raised so the
+    caller's own fallback (canned responses, keyword-only scoring) applies.
+    ``ModelServerError`` (the server answered with an error) always propagates
+    to that fallback rather than loading the models locally.
+    """
+    client = get_model_server_client()
+    if client is None:
+        return local()
+    try:
+        return remote(client)
+    except ModelServerUnavailable:
+        if not MODEL_SERVER_CONFIG["fallback_to_local"]:
+            raise
+        metrics.incr("model_server_local_fallbacks")
+        return local()
+
+
+class _ModelRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients can reuse pooled connections
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        from models import model_stats
+
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "models": model_stats()})
+        elif self.path == "/metrics":
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        from generation import generate_local
+        from sentiment import sentiment_engine
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length))
+            if self.path == "/generate":
+                params = tuple(tuple(pair) for pair in payload["params"])
+                result = {"text": generate_local(payload["prompt"], params)}
+            elif self.path == "/sentiment":
+                result = {"results": sentiment_engine.score_local(payload["texts"])}
+            else:
+                self._send_json(404, {"error": "not found"})
+                return
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+        else:
+            self._send_json(200, result)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host=None, port=None, warm=True):
+    """Run the model server until interrupted"""
+    global _serving
+    # Inside the server, generation and sentiment always run in-process
+    _serving = True
+    host = host or MODEL_SERVER_CONFIG["host"]
+    port = port or MODEL_SERVER_CONFIG["port"]
+
+    # Registers the analysis prompt prefix whose KV-cache generation reuses
+    import assistant  # noqa: F401
+
+    if warm:
+        from models import warm_up
+
+        warm_up(background=False)
+
+    server = ThreadingHTTPServer((host, port), _ModelRequestHandler)
+    server.daemon_threads = True
+    print(f"Model server listening on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared GPT-2 and sentiment inference server")
+    parser.add_argument("--host", default=MODEL_SERVER_CONFIG["host"])
+    parser.add_argument("--port", type=int, default=MODEL_SERVER_CONFIG["port"])
+    parser.add_argument("--no-warm-up", action="store_true", help="Load models on the first request instead of at startup")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, warm=not args.no_warm_up)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Process-wide registry for the local Hugging Face models used by the app.
+
+Imported modules are shared by every Streamlit session and rerun, so models
+loaded here are read from disk once per process and then reused.
+"""
+import threading
+import time
+
+from config import GENERATION_CONFIG, MODEL_CONFIG, MODEL_SERVER_CONFIG, SCORING_CONFIG
+from metrics import metrics
+
+
+class ModelLoadError(Exception):
+    """Raised while a model that recently failed to load is not retried"""
+
+
+class ModelRegistry:
+    """Thread-safe, load-once cache of models keyed by name.
+
+    A failed load is remembered for ``retry_interval`` seconds, so callers fall
+    back immediately instead of each repeating a slow failing load.
+    """
+
+    def __init__(self, retry_interval=None):
+        self.retry_interval = MODEL_CONFIG["load_retry_interval"] if retry_interval is None else retry_interval
+        self._models = {}
+        self._stats = {}
+        # key -> (exception, time.monotonic() of the failure)
+        self._failures = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key):
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def get(self, key, loader):
+        """Return the model stored under ``key``, calling ``loader()`` the first time"""
+        entry = self._models.get(key)
+        if entry is not None:
+            return entry
+
+        # One lock per key so a slow GPT-2 load does not block other models
+        with self._lock_for(key):
+            entry = self._models.get(key)
+            if entry is None:
+                self._check_failure(key)
+                start = time.perf_counter()
+                try:
+                    with metrics.timer(f"model_load_{key}"):
+                        entry = loader()
+                except Exception as e:
+                    self._failures[key] = (e, time.monotonic())
+                    metrics.incr("model_load_failures")
+                    raise
+                self._failures.pop(key, None)
+                self._stats[key] = {
+                    "load_seconds": round(time.perf_counter() - start, 3),
+                    "memory_bytes": estimate_memory_bytes(entry),
+                    "loaded_at": time.time(),
+                }
+                self._models[key] = entry
+        return entry
+
+    def _check_failure(self, key):
+        failure = self._failures.get(key)
+        if failure is None:
+            return
+        error, failed_at = failure
+        age = time.monotonic() - failed_at
+        if age < self.retry_interval:
+            raise ModelLoadError(f"{key} failed to load {age:.0f}s ago; retrying after {self.retry_interval}s") from error
+
+    def is_loaded(self, key):
+        return key in self._models
+
+    def stats(self):
+        """Load time and memory footprint of every model loaded so far"""
+        return {key: dict(value) for key, value in self._stats.items()}
+
+    def clear(self):
+        """Drop all loaded models (mainly useful for benchmarks measuring cold starts)"""
+        with self._locks_guard:
+            self._models.clear()
+            self._stats.clear()
+            self._failures.clear()
+
+
+def estimate_memory_bytes(entry):
+    """Approximate memory held by the torch modules in a registry entry"""
+    objects = entry if isinstance(entry, (tuple, list)) else (entry,)
+    total = 0
+    for obj in objects:
+        # Pipelines wrap the torch module in a ``model`` attribute
+        module = getattr(obj, "model", obj)
+        if not hasattr(module, "parameters"):
+            continue
+        for tensor in list(module.parameters()) + list(module.buffers()):
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+registry = ModelRegistry()
+
+
+def _load_gpt2():
+    from backends import load_generation_model
+
+    return load_generation_model(MODEL_CONFIG["generation_backend"])
+
+
+def get_generation_model():
+    """Return the shared ``(tokenizer, model)`` pair used for text generation"""
+    return registry.get("generation", _load_gpt2)
+
+
+def _load_draft_model():
+    from backends import load_torch_model
+
+    return load_torch_model(GENERATION_CONFIG["draft_model"])
+
+
+def get_draft_model():
+    """Return the shared draft model proposing tokens for assisted decoding"""
+    return registry.get("generation_draft", _load_draft_model)
+
+
+_warmup_thread = None
+_warmup_started = False
+_warmup_lock = threading.Lock()
+
+
+def warm_up(background=True):
+    """Load the models ahead of the first request; only the first call does anything
+
+    Returns the background loading thread, or None when the models were loaded
+    inline (by this call or an earlier ``background=False`` one).
+    """
+    global _warmup_thread, _warmup_started
+
+    def _load():
+        from model_server import ModelServerUnavailable, get_model_server_client
+        from sentiment import get_sentiment_pipeline
+
+        # With a shared model server the weights live there, not in this process
+        client = get_model_server_client()
+        if client is not None:
+            try:
+                client.health()
+                return
+            except ModelServerUnavailable:
+                if not MODEL_SERVER_CONFIG["fallback_to_local"]:
+                    return
+
+        loaders = [get_generation_model, get_sentiment_pipeline]
+        if GENERATION_CONFIG["draft_model"]:
+            loaders.append(get_draft_model)
+        if SCORING_CONFIG["ai_engine"] == "embedding":
+            from embedding_scoring import get_prototypes
+
+            loaders.append(get_prototypes)
+        for loader in loaders:
+            try:
+                loader()
+            except Exception:
+                # Callers already fall back when a model is unavailable
+                pass
+
+    with _warmup_lock:
+        if _warmup_started:
+            return _warmup_thread
+        _warmup_started = True
+        if background:
+            _warmup_thread = threading.Thread(target=_load, name="model-warmup", daemon=True)
+            _warmup_thread.start()
+            return _warmup_thread
+
+    _load()
+    return None
+
+
+def model_stats():
+    """Load time and memory footprint for the loaded models"""
+    return registry.stats()
@@ -0,0 +1,139 @@
+"""Deterministic daily question schedule.
+
+Each day's questions are drawn with a private RNG seeded from the date, so the
+schedule never depends on (or disturbs) the global ``random`` state. Selections
+for a range of dates around startup are precomputed into a compact table of
+question indices; looking up a day is a slice of that table. Assessments
+record ``SCHEDULE_VERSION`` so they can be matched to the rules that chose
+their questions.
+"""
+import random
+from datetime import date, timedelta
+
+from config import QUESTION_SCHEDULE_CONFIG
+
+# Bump whenever the question list or selection rule changes
+SCHEDULE_VERSION = 1
+
+# Personality assessment questions
+ALL_PERSONALITY_QUESTIONS = [
+    "How do you typically recharge your energy - through social interaction or solitude?",
+    "When making decisions, do you rely more on logic and analysis or feelings and values?",
+    "Do you prefer detailed planning or keeping your options open and being spontaneous?",
+    "How do you handle stress and overwhelming situations?",
+    "Describe your ideal work environment and what motivates you most.",
+    "How do you typically respond to criticism or feedback from others?",
+    "What are your biggest fears or anxieties in daily life?",
+    "What do you value most in friendships?",
+    "Describe your sleep patterns and how they affect your mood and energy.",
+    "How do you cope with major life changes or unexpected challenges?",
+    "What role does creativity play in your daily life?",
+    "How do you prefer to learn new things - hands-on, reading, or discussing with others?",
+    "What kind of music or sounds help you focus or relax?",
+    "How do you approach conflicts in personal relationships?",
+    "What does success mean to you personally?",
+    "How do you balance work and personal time?",
+    "What activities make you lose track of time?",
+    "How do you handle unexpected changes in your routine?",
+    "What motivates you to get up in the morning?",
+    "How do you prefer to celebrate achievements?",
+    "What kind of physical environment makes you feel most comfortable?",
+    "How do you approach making new friends or social connections?",
+    "What role does spirituality or philosophy play in your life?",
+    "How do you handle feeling overwhelmed or burnt out?",
+    "What childhood experiences shaped who you are today?",
+    "How do you prefer to receive and give emotional support?",
+    "What kind of challenges do you actively seek out?",
+    "How do you deal with uncertainty about the future?",
+    "What makes you feel most confident and self-assured?",
+    "How do you approach personal growth and self-improvement?",
+    "What role does humor play in your daily interactions?",
+    "How do you handle disappointment or failure?",
+    "What kind of legacy do you want to leave behind?",
+    "How do you prefer to spend your free time on weekends?",
+    "What triggers your strongest emotional responses?",
+    "How do you approach financial planning and security?",
+    "What kind of stories or movies resonate most with you?",
+    "How do you handle peer pressure or social expectations?",
+    "What makes you feel most alive and energized?",
+    "How do you approach forgiveness - of yourself and others?",
+    "What role does nature and the outdoors play in your well-being?",
+    "How do you handle compliments and praise from others?",
+    "What kind of conversations do you find most meaningful?",
+    "How do you approach risk-taking in different areas of life?",
+    "What habits or routines are most important to your daily life?",
+    "How do you handle being the center of attention?",
+    "What kind of books or content do you gravitate toward?",
+    "How do you approach helping others who are struggling?",
+    "What makes you feel most misunderstood by others?",
+    "How do you handle transitions between different life phases?",
+    "What role does competition play in motivating you?",
+    "How do you approach expressing your authentic self?",
+    "What kind of feedback helps you grow the most?",
+    "How do you handle moments of self-doubt?",
+    "What traditions or rituals are meaningful to you?",
+    "How do you approach setting and maintaining boundaries?",
+    "What makes you feel most connected to others?",
+    "How do you handle information overload in today's world?",
+    "What role does adventure play in your ideal life?",
+    "How do you approach making important life decisions?",
+    "What kind of work or activities drain your energy most?",
+    "How do you handle being criticized or judged by others?",
+    "What makes you feel most grateful in daily life?",
+    "How do you approach maintaining long-distance relationships?"
+]
+
+
+def select_question_indices(day, question_count, per_day):
+    """Indices of the questions asked on ``day``.
+
+    Seeded with the date as YYYYMMDD; version 1 reproduces the selections the
+    app made with ``random.seed`` before the schedule existed.
+    """
+    rng = random.Random(int(day.strftime("%Y%m%d")))
+    return rng.sample(range(question_count), per_day)
+
+
+class QuestionSchedule:
+    """Precomputed question selections for ``days`` consecutive dates from ``start``"""
+
+    def __init__(self, questions, start, days, per_day=None, version=SCHEDULE_VERSION):
+        self.questions = list(questions)
+        self.start = start
+        self.days = days
+        self.per_day = per_day or QUESTION_SCHEDULE_CONFIG["questions_per_day"]
+        self.version = version
+        if len(self.questions) > 256:
+            raise ValueError("the schedule table stores question indices as bytes")
+
+        # One byte per question index, per_day entries per date
+        table = bytearray()
+        for offset in range(days):
+            table.extend(select_question_indices(start + timedelta(days=offset), len(self.questions), self.per_day))
+        self._table = bytes(table)
+
+    def indices_for(self, day):
+        offset = (day - self.start).days
+        if 0 <= offset < self.days:
+            row = offset * self.per_day
+            return list(self._table[row:row + self.per_day])
+        return select_question_indices(day, len(self.questions), self.per_day)
+
+    def questions_for(self, day=None):
+        """The questions asked on ``day`` (default: today)"""
+        return [self.questions[index] for index in self.indices_for(day or date.today())]
+
+
+def _build_schedule():
+    today = date.today()
+    start = today - timedelta(days=QUESTION_SCHEDULE_CONFIG["days_before"])
+    days = QUESTION_SCHEDULE_CONFIG["days_before"] + QUESTION_SCHEDULE_CONFIG["days_after"] + 1
+    return QuestionSchedule(ALL_PERSONALITY_QUESTIONS, start, days)
+
+
+schedule = _build_schedule()
+
+
+def get_daily_questions(day=None):
+    """Questions for ``day`` (default: today) from the shared schedule"""
+    return schedule.questions_for(day)
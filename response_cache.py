@@ -0,0 +1,124 @@
+"""Bounded LRU/TTL cache for generated model responses"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import GENERATION_CONFIG, MODEL_CONFIG, RESPONSE_CACHE_CONFIG
+from metrics import metrics
+
+
+def normalize_prompt(prompt):
+    """Case- and whitespace-insensitive form of a prompt used for cache keys"""
+    return re.sub(r"\s+", " ", prompt).strip().casefold()
+
+
+def generation_model_identity():
+    """Settings that change which model produces a response"""
+    return [MODEL_CONFIG["generation_model"], MODEL_CONFIG["generation_backend"], GENERATION_CONFIG["draft_model"]]
+
+
+def make_key(prompt, params=()):
+    """Stable key for a prompt, its generation parameters and the generating model
+
+    Persisted responses from another model, backend or draft model never match.
+    """
+    payload = json.dumps(
+        [normalize_prompt(prompt), list(params), generation_model_identity()], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """In-memory LRU with expiry, optionally backed by a local SQLite file"""
+
+    def __init__(self, max_entries=1024, ttl_seconds=None, persist_path=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if persist_path:
+            self._db = sqlite3.connect(persist_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _expired(self, created):
+        return self.ttl_seconds is not None and time.time() - created > self.ttl_seconds
+
+    def get(self, key):
+        """Cached value for ``key``, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1])
+                    self._store(key, entry)
+            if entry is None or self._expired(entry[1]):
+                if entry is not None:
+                    self._delete(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            created = time.time()
+            self._store(key, (value, created))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                    (key, value, created),
+                )
+                self._db.commit()
+
+    def _store(self, key, entry):
+        """Insert into the in-memory LRU, evicting down to ``max_entries``"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _delete(self, key):
+        self._entries.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE_CONFIG["max_entries"],
+    ttl_seconds=RESPONSE_CACHE_CONFIG["ttl_seconds"],
+    persist_path=RESPONSE_CACHE_CONFIG["persist_path"],
+)
+metrics.register_collector("response_cache", response_cache.stats)
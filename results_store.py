@@ -0,0 +1,278 @@
+"""Indexed storage for completed assessments.
+
+Assessments are written once into a SQLite database in WAL mode, keyed by an
+assessment ID so repeated saves of the same assessment are no-ops, and indexed
+by name, date and primary personality type for fast listing and lookup. Saves
+from the app go through a background writer so they never block page renders.
+"""
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from config import RESULTS_CONFIG
+from metrics import metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    assessment_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    age TEXT,
+    timestamp TEXT NOT NULL,
+    date TEXT NOT NULL,
+    primary_type TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_name ON assessments (name_key, date);
+CREATE INDEX IF NOT EXISTS idx_assessments_date ON assessments (date);
+CREATE INDEX IF NOT EXISTS idx_assessments_type ON assessments (primary_type, date);
+"""
+
+
+class ResultsStore:
+    """SQLite-backed, idempotent store of assessment results"""
+
+    def __init__(self, path=None):
+        self.path = path or RESULTS_CONFIG["store_path"]
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # FULL syncs the WAL on every commit, so each committed batch survives power loss
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def save(self, assessment_id, record, primary_type=None):
+        """Store ``record`` once; returns False when the assessment was already saved"""
+        return self.save_many([(assessment_id, record, primary_type)]) == 1
+
+    def save_many(self, entries):
+        """Store several ``(assessment_id, record, primary_type)`` entries in one transaction"""
+        rows = []
+        for assessment_id, record, primary_type in entries:
+            timestamp = record["timestamp"]
+            rows.append((
+                assessment_id,
+                record["name"],
+                record["name"].casefold(),
+                str(record.get("age", "")),
+                timestamp,
+                timestamp[:10],
+                primary_type,
+                json.dumps(record),
+            ))
+        with self._lock, metrics.timer("persistence"):
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO assessments "
+                "(assessment_id, name, name_key, age, timestamp, date, primary_type, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.commit()
+            saved = self._db.total_changes - before
+        metrics.incr("assessments_saved", saved)
+        return saved
+
+    def get(self, assessment_id):
+        """Full record for one assessment, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM assessments WHERE assessment_id = ?", (assessment_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def exists(self, assessment_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM assessments WHERE assessment_id = ?", (assessment_id,)
+            ).fetchone()
+        return row is not None
+
+    def list(self, name=None, date=None, primary_type=None, limit=100, offset=0):
+        """Summaries of matching assessments, newest first"""
+        clauses, params = [], []
+        if name is not None:
+            clauses.append("name_key = ?")
+            params.append(name.casefold())
+        if date is not None:
+            clauses.append("date = ?")
+            params.append(date)
+        if primary_type is not None:
+            clauses.append("primary_type = ?")
+            params.append(primary_type)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT assessment_id, name, age, timestamp, primary_type FROM assessments "
+                f"{where} ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return [
+            {"assessment_id": r[0], "name": r[1], "age": r[2], "timestamp": r[3], "primary_type": r[4]}
+            for r in rows
+        ]
+
+    def iter_records(self, batch_size=500):
+        """Yield ``(assessment_id, record)`` for every stored assessment"""
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT assessment_id, payload FROM assessments WHERE assessment_id > ? "
+                    "ORDER BY assessment_id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for assessment_id, payload in rows:
+                yield assessment_id, json.loads(payload)
+            last_id = rows[-1][0]
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM assessments").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_results_store():
+    """Process-wide store shared by every session"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultsStore()
+    return _store
+
+
+class AsyncResultWriter:
+    """Background writer that persists assessments off the render path.
+
+    Submissions go into a bounded queue; the worker commits them in batches (one
+    transaction, and so one sync to disk, per batch). A full queue is reported
+    back to the caller instead of blocking, and pending writes are drained when
+    the process exits.
+    """
+
+    def __init__(self, store_factory=get_results_store, max_queue=None, batch_size=None, flush_interval=None):
+        self._store_factory = store_factory
+        self.batch_size = batch_size or RESULTS_CONFIG["writer_batch_size"]
+        self.flush_interval = RESULTS_CONFIG["writer_flush_interval"] if flush_interval is None else flush_interval
+        self._queue = queue.Queue(maxsize=max_queue or RESULTS_CONFIG["writer_queue_size"])
+        self._statuses = OrderedDict()
+        self._status_lock = threading.Lock()
+        self._closed = False
+        self.saved = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+        self._worker = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._worker.start()
+
+    def _set_status(self, assessment_id, status):
+        with self._status_lock:
+            self._statuses[assessment_id] = status
+            self._statuses.move_to_end(assessment_id)
+            # Only recent assessments need their status reported
+            while len(self._statuses) > 10000:
+                self._statuses.popitem(last=False)
+
+    def submit(self, assessment_id, record, primary_type=None):
+        """Queue an assessment for saving; returns False when the queue is full"""
+        if self._closed:
+            return False
+        self._set_status(assessment_id, "queued")
+        try:
+            self._queue.put_nowait((assessment_id, record, primary_type))
+        except queue.Full:
+            self.rejected += 1
+            with self._status_lock:
+                self._statuses.pop(assessment_id, None)
+            return False
+        return True
+
+    def status(self, assessment_id):
+        """'queued', 'saved', 'failed' or None for an unknown assessment"""
+        with self._status_lock:
+            return self._statuses.get(assessment_id)
+
+    def stats(self):
+        """Queue depth and counters, used to report back-pressure"""
+        return {
+            "pending": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "saved": self.saved,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "batches": self.batches,
+        }
+
+    def _next_batch(self):
+        entry = self._queue.get()
+        if entry is None:
+            return None
+        batch = [entry]
+        while len(batch) < self.batch_size:
+            try:
+                entry = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                break
+            if entry is None:
+                # Put the shutdown marker back so the loop ends after this batch
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self._store_factory().save_many(batch)
+                status = "saved"
+                self.saved += len(batch)
+            except Exception:
+                status = "failed"
+                self.failed += len(batch)
+            self.batches += 1
+            for assessment_id, _, _ in batch:
+                self._set_status(assessment_id, status)
+
+    def close(self, timeout=10):
+        """Stop accepting work and wait for pending writes to reach disk"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+
+_writer = None
+
+
+def get_result_writer():
+    """Process-wide background writer, drained at interpreter exit"""
+    global _writer
+    if _writer is None:
+        with _store_lock:
+            if _writer is None:
+                _writer = AsyncResultWriter()
+                atexit.register(_writer.close)
+                metrics.register_collector("results_writer", _writer.stats)
+    return _writer
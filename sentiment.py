@@ -0,0 +1,79 @@
+"""Batched sentiment scoring built once per process"""
+from batching import MicroBatcher, QueueFullError
+from config import MODEL_CONFIG, SENTIMENT_CONFIG
+from lazy import transformers
+from metrics import metrics
+from model_server import call_with_fallback
+from models import registry
+
+# Character limit applied to each response before tokenization
+MAX_RESPONSE_CHARS = 512
+
+
+def _load_sentiment_pipeline():
+    return transformers.pipeline("sentiment-analysis", model=MODEL_CONFIG["sentiment_model"])
+
+
+def get_sentiment_pipeline():
+    """Return the shared sentiment-analysis pipeline"""
+    return registry.get("sentiment", _load_sentiment_pipeline)
+
+
+def classify_batch(texts):
+    """Score texts in one padded forward pass, returning ``{'label', 'score'}`` dicts"""
+    if not texts:
+        return []
+    analyzer = get_sentiment_pipeline()
+    batch = [text[:MAX_RESPONSE_CHARS] for text in texts]
+    metrics.incr("sentiment_texts", len(batch))
+    with metrics.timer("sentiment"):
+        return analyzer(batch, batch_size=len(batch), truncation=True)
+
+
+class SentimentEngine:
+    """Scores a user's responses, sharing batches across concurrent sessions"""
+
+    def __init__(self, batch_window=None, max_batch_size=None, timeout=None):
+        config = SENTIMENT_CONFIG
+        self.timeout = config["timeout"] if timeout is None else timeout
+        self._batcher = MicroBatcher(
+            classify_batch,
+            max_batch_size=config["max_batch_size"] if max_batch_size is None else max_batch_size,
+            max_wait=config["batch_window"] if batch_window is None else batch_window,
+            max_queue=config["max_queue"],
+            name="sentiment-batcher",
+        )
+
+    def score(self, responses):
+        """Sentiment for each non-empty response, in order"""
+        texts = [response for response in responses if response.strip()]
+        if not texts:
+            return []
+        return call_with_fallback(
+            lambda client: client.classify(texts),
+            lambda: self.score_local(texts),
+        )
+
+    def submit(self, texts):
+        """Queue texts on the shared batcher without blocking; one Future per text"""
+        return self._batcher.submit_futures(texts)
+
+    def score_local(self, texts):
+        """In-process sentiment for ``texts``, batched with other sessions"""
+        if not texts:
+            return []
+        if not SENTIMENT_CONFIG["cross_session_batching"]:
+            return classify_batch(texts)
+        try:
+            return self._batcher.submit_many(texts, timeout=self.timeout)
+        except (QueueFullError, TimeoutError):
+            # Saturated batcher: score this user's responses directly
+            return classify_batch(texts)
+
+
+sentiment_engine = SentimentEngine()
+
+
+def score_responses(responses):
+    """Sentiment results consumed by ``analyze_with_ai``"""
+    return sentiment_engine.score(responses)
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+import assistant
+import async_client
+import engine
+from batching import QueueFullError
+from response_cache import ResponseCache
+
+SYSTEM_PROMPT = "You are a careful assistant."
+GENERATED = "You plan ahead and stay calm. You also enjoy helping others. And then"
+
+
+@pytest.fixture(autouse=True)
+def private_cache(monkeypatch):
+    monkeypatch.setattr(assistant, "response_cache", ResponseCache())
+
+
+def _generate_with(monkeypatch, outcome):
+    """Make both the blocking and the async generation return or raise ``outcome``"""
+    def generate(prompt, params=None, timeout=None):
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def generate_async(prompt, params=None, timeout=None):
+        return generate(prompt, params, timeout)
+
+    monkeypatch.setattr(assistant, "generate", generate)
+    monkeypatch.setattr(async_client, "generate", generate_async)
+
+
+def test_model_response_matches_the_blocking_call(monkeypatch):
+    _generate_with(monkeypatch, GENERATED)
+    sync = assistant.get_model_response("How do you relax?", SYSTEM_PROMPT)
+    assistant.response_cache.clear()
+    async_ = asyncio.run(async_client.model_response("How do you relax?", SYSTEM_PROMPT))
+
+    assert sync == async_ == "You plan ahead and stay calm.  You also enjoy helping others."
+
+
+def test_model_responses_share_the_cache(monkeypatch):
+    _generate_with(monkeypatch, GENERATED)
+    sync = assistant.get_model_response("How do you relax?", SYSTEM_PROMPT)
+    _generate_with(monkeypatch, RuntimeError("not called"))
+
+    assert asyncio.run(async_client.model_response("How do you relax?", SYSTEM_PROMPT)) == sync
+    assert assistant.response_cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("error, counter", [(QueueFullError(), "generation_queue_full"), (RuntimeError(), "fallback_responses")])
+def test_failures_fall_back_alike(monkeypatch, error, counter):
+    _generate_with(monkeypatch, error)
+    counted = []
+    monkeypatch.setattr(assistant.metrics, "incr", lambda name, amount=1: counted.append(name))
+    monkeypatch.setattr(assistant, "get_fallback_response", lambda user_prompt, system_prompt: "Canned.")
+
+    assert assistant.get_model_response("Under stress?", SYSTEM_PROMPT) == "Canned."
+    assert asyncio.run(async_client.model_response("Under stress?", SYSTEM_PROMPT)) == "Canned."
+    assert counted == [counter, counter]
+
+
+@pytest.mark.parametrize("use_ai", [True, False])
+@pytest.mark.parametrize("response", ["I analyze the data and plan carefully.", "   ", ""])
+def test_answer_features_match_the_blocking_call(monkeypatch, response, use_ai):
+    sentiment = {"label": "POSITIVE", "score": 0.9}
+    monkeypatch.setattr(engine, "score_responses", lambda texts: [sentiment for _ in texts])
+
+    async def classify_batch(texts, timeout=None):
+        return [sentiment for _ in texts]
+
+    monkeypatch.setattr(async_client, "classify_batch", classify_batch)
+
+    expected = engine.extract_answer_features(response, use_ai)
+    assert asyncio.run(async_client.answer_features(response, use_ai)) == expected
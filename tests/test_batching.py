@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from batching import MicroBatcher, QueueFullError
+
+
+def _blocking_batcher(**kwargs):
+    """Batcher whose first batch waits on ``release``; records every batch it runs"""
+    release = threading.Event()
+    started = threading.Event()
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        started.set()
+        release.wait(5)
+        return [item * 2 for item in items]
+
+    return MicroBatcher(process, **kwargs), release, started, batches
+
+
+def test_results_keep_submission_order():
+    batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_wait=0.05)
+    assert batcher.submit_many([1, 2, 3], timeout=5) == [2, 4, 6]
+    assert batcher.items_processed == 3
+
+
+def test_batch_errors_reach_the_caller():
+    def process(items):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(process)
+    with pytest.raises(ValueError, match="model failed"):
+        batcher.submit("x", timeout=5)
+
+
+def test_timeout_raises_and_drops_abandoned_items():
+    batcher, release, started, batches = _blocking_batcher(max_wait=0)
+    blocker = batcher.submit_futures(["blocker"])[0]
+    assert started.wait(5)
+
+    with pytest.raises(TimeoutError):
+        batcher.submit_many([1, 2], timeout=0.05)
+    follow_up = batcher.submit_futures([3])[0]
+    release.set()
+
+    assert follow_up.result(5) == 6
+    assert blocker.result(5) == "blockerblocker"
+    # The timed-out items never reached process_batch
+    assert batches == [["blocker"], [3]]
+
+
+def test_cancelled_futures_are_dropped_before_processing():
+    batcher, release, started, batches = _blocking_batcher(max_wait=0)
+    batcher.submit_futures(["blocker"])
+    assert started.wait(5)
+
+    cancelled, kept = batcher.submit_futures([1, 2])
+    assert cancelled.cancel()
+    release.set()
+
+    assert kept.result(5) == 4
+    assert cancelled.cancelled()
+    assert batches == [["blocker"], [2]]
+
+
+def test_started_futures_cannot_be_cancelled():
+    batcher, release, started, _ = _blocking_batcher()
+    future = batcher.submit_futures([1])[0]
+    assert started.wait(5)
+
+    assert not future.cancel()
+    release.set()
+    assert future.result(5) == 2
+
+
+def test_full_queue_rejects_the_whole_submission():
+    batcher, release, started, batches = _blocking_batcher(max_wait=0, max_queue=2)
+    batcher.submit_futures(["blocker"])
+    assert started.wait(5)
+
+    with pytest.raises(QueueFullError):
+        batcher.submit_futures([1, 2, 3])
+    release.set()
+    deadline = time.monotonic() + 5
+    while batcher.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Whatever fitted before the queue filled up is dropped, not processed
+    assert batcher.submit(4, timeout=5) == 8
+    assert batches == [["blocker"], [4]]
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+import cohort
+import engine
+from keywords import SCORING_MATCHER, KeywordMatcher
+
+KEYWORDS = sorted({word for words in SCORING_MATCHER.categories.values() for word in words})
+FILLER = "i we the and but when usually often think feel work friends people time".split()
+AFFIXES = ["", "", "", "un", "re", "s", "ly", "ing", "-", "_", "'", ",", ".", "!", "(", ")"]
+
+
+def fuzzed_assessment(rng):
+    """Eight answers mixing keywords, keyword fragments, affixes and phrase pieces"""
+    responses = []
+    for _ in range(8):
+        tokens = []
+        for _ in range(rng.randint(0, 25)):
+            roll = rng.random()
+            if roll < 0.3:
+                word = rng.choice(KEYWORDS)
+            elif roll < 0.4:
+                # Half a phrase or keyword, so matches can straddle tokens and answers
+                word = rng.choice(KEYWORDS)
+                word = word[:rng.randint(1, len(word))] if rng.random() < 0.5 else word[rng.randint(0, len(word) - 1):]
+            else:
+                word = rng.choice(FILLER)
+            word = rng.choice(AFFIXES) + word + rng.choice(AFFIXES)
+            tokens.append(word.upper() if rng.random() < 0.1 else word)
+        responses.append(rng.choice([" ", "  ", "\n", "\t"]).join(tokens))
+    return responses
+
+
+def expected_scores(responses):
+    """What analyze_personality_traits computes one user at a time, before any AI adjustment"""
+    text = ' '.join(responses).lower()
+    hits = engine.SCORING_MATCHER.match(text)
+    scores = engine.analyze_with_keywords(text, hits)
+    scores['aggressive'] = len(hits['aggressive'])
+    scores['concerning'] = len(hits['concerning'])
+    scores['aggressive_score'] = 2 * len(hits['aggressive']) + 3 * len(hits['concerning'])
+    return scores
+
+
+@pytest.mark.parametrize("word_boundary", [False, True])
+@pytest.mark.parametrize("use_scipy", [True, False])
+def test_cohort_scores_match_per_user_analysis(monkeypatch, word_boundary, use_scipy):
+    matcher = KeywordMatcher(SCORING_MATCHER.categories, word_boundary=word_boundary)
+    monkeypatch.setattr(cohort, "SCORING_MATCHER", matcher)
+    monkeypatch.setattr(engine, "SCORING_MATCHER", matcher)
+    if not use_scipy:
+        monkeypatch.setattr(cohort, "sparse", None)
+
+    rng = random.Random(word_boundary)
+    assessments = [fuzzed_assessment(rng) for _ in range(750)] + [[], [""] * 8]
+    # Small chunks, so documents are also scored against each other's vocabularies
+    scores = cohort.score_assessments(assessments, chunk_size=97)
+
+    for index, responses in enumerate(assessments):
+        expected = expected_scores(responses)
+        actual = {category: int(values[index]) for category, values in scores.items()}
+        assert actual == expected, responses
+
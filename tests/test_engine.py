@@ -0,0 +1,133 @@
+import engine
+from config import SCORING_CONFIG
+from engine import traits_cache_key
+from response_cache import ResponseCache
+
+RESPONSES = ["I plan everything carefully.", "I love helping my friends."]
+
+
+def test_traits_cache_key_is_stable():
+    assert traits_cache_key(RESPONSES, "Sam", 30) == traits_cache_key(list(RESPONSES), "Sam", "30")
+
+
+def test_traits_cache_key_depends_on_every_input():
+    key = traits_cache_key(RESPONSES, "Sam", 30)
+    assert traits_cache_key(RESPONSES[::-1], "Sam", 30) != key
+    assert traits_cache_key(RESPONSES + [""], "Sam", 30) != key
+    assert traits_cache_key(RESPONSES, "Alex", 30) != key
+    assert traits_cache_key(RESPONSES, "Sam", 31) != key
+    assert traits_cache_key(RESPONSES, "Sam", 30, use_ai=False) != key
+
+
+def test_traits_cache_key_changes_with_scoring_rules(monkeypatch):
+    key = traits_cache_key(RESPONSES, "Sam", 30)
+    monkeypatch.setitem(SCORING_CONFIG, "keyword_word_boundary", not SCORING_CONFIG["keyword_word_boundary"])
+    assert traits_cache_key(RESPONSES, "Sam", 30) != key
+    monkeypatch.undo()
+    monkeypatch.setattr(engine, "SCORING_VERSION", engine.SCORING_VERSION + "-next")
+    assert traits_cache_key(RESPONSES, "Sam", 30) != key
+
+
+def _count_analyses(monkeypatch, ai_scored):
+    calls = []
+
+    def analyze(responses, name, age, sentiment_results, use_ai, keyword_hits=None):
+        calls.append(responses)
+        return {"Analytical Thinker": 1.0}, ai_scored
+
+    monkeypatch.setattr(engine, "traits_cache", ResponseCache())
+    monkeypatch.setattr(engine, "_analyze_personality_traits", analyze)
+    return calls
+
+
+def test_analysis_is_memoized(monkeypatch):
+    calls = _count_analyses(monkeypatch, ai_scored=True)
+    first = engine.analyze_personality_traits(RESPONSES, "Sam", 30)
+    assert engine.analyze_personality_traits(RESPONSES, "Sam", 30) == first
+    assert len(calls) == 1
+
+
+def test_keyword_fallback_after_ai_failure_is_retried(monkeypatch):
+    calls = _count_analyses(monkeypatch, ai_scored=False)
+    engine.analyze_personality_traits(RESPONSES, "Sam", 30)
+    engine.analyze_personality_traits(RESPONSES, "Sam", 30)
+    assert len(calls) == 2
+
+    engine.analyze_personality_traits(RESPONSES, "Sam", 30, use_ai=False)
+    engine.analyze_personality_traits(RESPONSES, "Sam", 30, use_ai=False)
+    assert len(calls) == 3
+
+
+def _ai_scores(monkeypatch, generate):
+    monkeypatch.setattr(engine, "generate_model_response", generate)
+    sentiment = [{"label": "POSITIVE", "score": 0.9}] * len(RESPONSES)
+    return engine.analyze_with_ai(RESPONSES, sentiment)
+
+
+def test_generated_insight_earns_indicator_points(monkeypatch):
+    scores = _ai_scores(monkeypatch, lambda user_prompt, system_prompt: "A logical and caring person.")
+    assert scores['Analytical Thinker'] == 3
+    assert scores['Empathetic Connector'] == 3 + 1
+    assert 'insight_failed' not in scores
+
+
+def test_failed_generation_earns_no_indicator_points(monkeypatch):
+    def unavailable(user_prompt, system_prompt):
+        raise RuntimeError("model unavailable")
+
+    scores = _ai_scores(monkeypatch, unavailable)
+    assert scores['insight_failed']
+    assert [scores[trait] for trait in engine.TRAIT_KEYWORDS] == [0, 0, 1, 1, 0]
+
+
+def test_failed_generation_is_not_memoized(monkeypatch):
+    def unavailable(user_prompt, system_prompt):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(engine, "traits_cache", ResponseCache())
+    monkeypatch.setattr(engine, "generate_model_response", unavailable)
+    monkeypatch.setattr(engine, "score_responses", lambda responses: [{"label": "POSITIVE", "score": 0.9}] * len(responses))
+    results = [engine.analyze_personality_traits(RESPONSES, "Sam", 30) for _ in range(3)]
+
+    assert all(result == results[0] for result in results)
+    assert engine.traits_cache.stats()["entries"] == 0
+
+
+def _features(response, sentiment=None):
+    return {
+        'response': response,
+        'keywords': sorted(engine.SCORING_MATCHER.find(response.lower())),
+        'sentiment': sentiment,
+    }
+
+
+def _record_scoring(monkeypatch):
+    batches = []
+
+    def score(responses):
+        batches.append(list(responses))
+        return [{"label": "POSITIVE", "score": 0.9} for _ in responses]
+
+    monkeypatch.setattr(engine, "score_responses", score)
+    return batches
+
+
+def test_stale_answers_are_scored_in_one_batch(monkeypatch):
+    batches = _record_scoring(monkeypatch)
+    positive = {"label": "POSITIVE", "score": 0.8}
+    features = [_features("An old answer.", positive), _features(RESPONSES[1], positive)]
+    responses = ["A new answer.", RESPONSES[1], "One more answer."]
+
+    sentiment_results, keyword_hits = engine.aggregate_answer_features(responses, features)
+
+    assert batches == [["A new answer.", "One more answer."]]
+    assert sentiment_results == [{"label": "POSITIVE", "score": 0.9}, positive, {"label": "POSITIVE", "score": 0.9}]
+    assert keyword_hits == engine.SCORING_MATCHER.match(" ".join(responses).lower())
+
+
+def test_keyword_only_aggregation_runs_no_sentiment(monkeypatch):
+    batches = _record_scoring(monkeypatch)
+    sentiment_results, _ = engine.aggregate_answer_features(RESPONSES, [], use_ai=False)
+
+    assert batches == []
+    assert sentiment_results is None
@@ -0,0 +1,51 @@
+import pytest
+
+import generation
+
+
+@pytest.fixture
+def whole_generation(monkeypatch):
+    """Records prompts generated whole; in-process streaming fails the test"""
+    prompts = []
+
+    def generate(prompt, params=None, timeout=None):
+        prompts.append(prompt)
+        return "A whole continuation."
+
+    def stream_local(prompt, params, stop):
+        raise AssertionError("streamed in-process")
+
+    monkeypatch.setattr(generation, "generate", generate)
+    monkeypatch.setattr(generation, "_stream_local", stream_local)
+    return prompts
+
+
+def test_configured_server_generates_whole(monkeypatch, whole_generation):
+    monkeypatch.setattr(generation, "get_model_server_client", lambda: object())
+    assert list(generation.stream_generate("prompt")) == ["A whole continuation."]
+    assert whole_generation == ["prompt"]
+
+
+def test_busy_stream_slots_generate_whole(monkeypatch, whole_generation):
+    monkeypatch.setattr(generation, "get_model_server_client", lambda: None)
+    monkeypatch.setattr(generation, "_stream_slots", generation.threading.BoundedSemaphore(1))
+    generation._stream_slots.acquire()
+    try:
+        assert list(generation.stream_generate("prompt")) == ["A whole continuation."]
+    finally:
+        generation._stream_slots.release()
+
+
+def test_abandoned_stream_frees_its_slot(monkeypatch):
+    def stream_local(prompt, params, stop):
+        yield "A"
+        yield " continuation."
+
+    monkeypatch.setattr(generation, "get_model_server_client", lambda: None)
+    monkeypatch.setattr(generation, "_stream_local", stream_local)
+    monkeypatch.setattr(generation, "_stream_slots", generation.threading.BoundedSemaphore(1))
+    stream = generation.stream_generate("prompt")
+    assert next(stream) == "A"
+    assert not generation._stream_slots.acquire(blocking=False)
+    stream.close()
+    assert generation._stream_slots.acquire(blocking=False)
@@ -0,0 +1,66 @@
+import re
+
+import pytest
+
+from keywords import (
+    AGGRESSIVE_KEYWORDS,
+    CONCERNING_PATTERNS,
+    FALLBACK_CATEGORIES,
+    TRAIT_KEYWORDS,
+    KeywordMatcher,
+)
+
+CATEGORIES = dict(TRAIT_KEYWORDS, aggressive=AGGRESSIVE_KEYWORDS, concerning=CONCERNING_PATTERNS)
+
+TEXTS = [
+    "",
+    "i like to analyze data and make a structured, logical plan.",
+    "failure makes me stronger; i never give up and push through.",
+    "i feel powerful when i see other people fail and their weakness in others",
+    "creativity, creative and uncreative designs; i designed it myself",
+    "the analyst analyzes analysis data-driven facts_and evidence",
+    "overcome, overcoming, persevered, weakly, weak around me",
+    "balance depends on how flexible and adaptable i am, it varies",
+]
+
+
+def naive_find(categories, text, word_boundary=False):
+    """Reference semantics: one scan per keyword"""
+    words = {word for words in categories.values() for word in words}
+    if word_boundary:
+        return {word for word in words if re.search(r"\b" + re.escape(word) + r"\b", text)}
+    return {word for word in words if word in text}
+
+
+@pytest.mark.parametrize("word_boundary", [False, True])
+@pytest.mark.parametrize("text", TEXTS)
+def test_find_matches_a_naive_scan(text, word_boundary):
+    matcher = KeywordMatcher(CATEGORIES, word_boundary=word_boundary)
+    assert matcher.find(text) == naive_find(CATEGORIES, text, word_boundary)
+
+
+@pytest.mark.parametrize("word_boundary", [False, True])
+def test_find_joined_matches_find_on_the_joined_text(word_boundary):
+    matcher = KeywordMatcher(CATEGORIES, word_boundary=word_boundary)
+    # Splits inside keywords, so some only exist across a separator
+    parts = ["i never", "give up and", "help", "others; weak", "around me", "", "push", "through"]
+    hits = [matcher.find(part) for part in parts]
+    joined = " ".join(parts)
+
+    assert matcher.find_joined(parts, hits) == matcher.find(joined)
+    assert matcher.find_joined(parts, hits) == naive_find(CATEGORIES, joined, word_boundary)
+
+
+def test_match_groups_in_keyword_order():
+    matcher = KeywordMatcher(CATEGORIES)
+    matched = matcher.match("systematic analysis with logic")
+
+    assert matched['Analytical Thinker'] == ['analysis', 'logic', 'systematic']
+    assert matched['aggressive'] == []
+
+
+def test_first_category_follows_definition_order():
+    matcher = KeywordMatcher(FALLBACK_CATEGORIES)
+    assert matcher.first_category("i had to decide under pressure") == 'stress'
+    assert matcher.first_category("i had to decide") == 'decision'
+    assert matcher.first_category("nothing relevant", default='general') == 'general'
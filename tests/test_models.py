@@ -0,0 +1,61 @@
+import pytest
+
+from models import ModelLoadError, ModelRegistry
+
+
+def _failing_loader(calls):
+    def loader():
+        calls.append(1)
+        raise OSError("offline")
+
+    return loader
+
+
+def test_models_load_once():
+    registry = ModelRegistry()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return object()
+
+    assert registry.get("model", loader) is registry.get("model", loader)
+    assert len(calls) == 1
+    assert registry.is_loaded("model")
+
+
+def test_failed_load_is_not_retried_within_the_interval():
+    registry = ModelRegistry(retry_interval=60)
+    calls = []
+    with pytest.raises(OSError):
+        registry.get("model", _failing_loader(calls))
+    with pytest.raises(ModelLoadError):
+        registry.get("model", _failing_loader(calls))
+
+    assert len(calls) == 1
+    assert not registry.is_loaded("model")
+
+
+def test_failed_load_is_retried_after_the_interval(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("models.time.monotonic", lambda: now[0])
+    registry = ModelRegistry(retry_interval=60)
+    calls = []
+    with pytest.raises(OSError):
+        registry.get("model", _failing_loader(calls))
+
+    now[0] += 61
+    model = object()
+    assert registry.get("model", lambda: model) is model
+    assert len(calls) == 1
+
+
+def test_clear_forgets_failures():
+    registry = ModelRegistry(retry_interval=60)
+    calls = []
+    with pytest.raises(OSError):
+        registry.get("model", _failing_loader(calls))
+    registry.clear()
+    with pytest.raises(OSError):
+        registry.get("model", _failing_loader(calls))
+    assert len(calls) == 2
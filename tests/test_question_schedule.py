@@ -0,0 +1,43 @@
+import random
+from datetime import date, timedelta
+
+from question_schedule import ALL_PERSONALITY_QUESTIONS, QuestionSchedule, get_daily_questions
+
+START = date(2024, 1, 1)
+DAYS = 700
+
+
+def baseline_questions(day):
+    """The app's selection before the schedule: reseed the global RNG with YYYYMMDD"""
+    random.seed(int(day.strftime("%Y%m%d")))
+    return random.sample(ALL_PERSONALITY_QUESTIONS, 8)
+
+
+def test_precomputed_days_match_the_baseline_selection():
+    schedule = QuestionSchedule(ALL_PERSONALITY_QUESTIONS, START, DAYS, per_day=8)
+    state = random.getstate()
+    try:
+        for offset in range(DAYS):
+            day = START + timedelta(days=offset)
+            assert schedule.questions_for(day) == baseline_questions(day), day
+    finally:
+        random.setstate(state)
+
+
+def test_days_outside_the_table_match_the_baseline_selection():
+    schedule = QuestionSchedule(ALL_PERSONALITY_QUESTIONS, START, 1, per_day=8)
+    state = random.getstate()
+    try:
+        for day in (START - timedelta(days=1), START + timedelta(days=1), date(2031, 2, 28)):
+            assert schedule.questions_for(day) == baseline_questions(day), day
+    finally:
+        random.setstate(state)
+
+
+def test_selection_leaves_the_global_random_state_alone():
+    random.seed(1234)
+    expected = random.random()
+    random.seed(1234)
+    get_daily_questions(date(2025, 6, 1))
+    get_daily_questions(date(2040, 6, 1))
+    assert random.random() == expected
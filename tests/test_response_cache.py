@@ -0,0 +1,85 @@
+import time
+
+import response_cache
+from response_cache import ResponseCache, make_key
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats()["entries"] == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = ResponseCache(ttl_seconds=60)
+    cache.set("a", "1")
+
+    now[0] += 59
+    assert cache.get("a") == "1"
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 0}
+
+
+def test_persisted_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(persist_path=path)
+    cache.set("a", "1")
+
+    reopened = ResponseCache(persist_path=path)
+    assert reopened.get("a") == "1"
+    assert reopened.get("missing") is None
+
+
+def test_expired_persisted_entries_are_deleted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    path = str(tmp_path / "responses.sqlite3")
+    ResponseCache(ttl_seconds=60, persist_path=path).set("a", "1")
+
+    now[0] += 120
+    assert ResponseCache(ttl_seconds=60, persist_path=path).get("a") is None
+    now[0] = 1000.0
+    assert ResponseCache(ttl_seconds=60, persist_path=path).get("a") is None
+
+
+def test_read_back_respects_max_entries(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    writer = ResponseCache(persist_path=path)
+    for key in "abcd":
+        writer.set(key, key)
+
+    reader = ResponseCache(max_entries=2, persist_path=path)
+    for key in "abcd":
+        assert reader.get(key) == key
+    assert reader.stats()["entries"] == 2
+
+
+def test_clear_empties_memory_and_disk(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(persist_path=path)
+    cache.set("a", "1")
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert ResponseCache(persist_path=path).get("a") is None
+
+
+def test_keys_ignore_case_and_whitespace():
+    assert make_key("Hello  there\n", (("temperature", 0.7),)) == make_key("hello there", (("temperature", 0.7),))
+    assert make_key("hello", (("temperature", 0.7),)) != make_key("hello", (("temperature", 0.9),))
+
+
+def test_keys_depend_on_the_generating_model(monkeypatch):
+    key = make_key("hello")
+    monkeypatch.setitem(response_cache.MODEL_CONFIG, "generation_model", "distilgpt2")
+    assert make_key("hello") != key
@@ -0,0 +1,97 @@
+import threading
+
+from results_store import AsyncResultWriter, ResultsStore
+
+
+def _record(name, timestamp="2024-05-01T12:00:00"):
+    return {"name": name, "age": 30, "timestamp": timestamp}
+
+
+def test_saving_twice_stores_once(tmp_path):
+    store = ResultsStore(str(tmp_path / "assessments.sqlite3"))
+    assert store.save("id-1", _record("user"))
+    assert not store.save("id-1", _record("user"))
+    assert store.count() == 1
+
+
+def test_records_survive_a_restart(tmp_path):
+    path = str(tmp_path / "assessments.sqlite3")
+    ResultsStore(path).save("id-1", _record("Sam"), "Analytical Thinker")
+
+    reopened = ResultsStore(path)
+    assert reopened.get("id-1") == _record("Sam")
+    assert reopened.exists("id-1")
+    assert reopened.get("missing") is None
+
+
+def test_list_filters_and_orders_newest_first(tmp_path):
+    store = ResultsStore(str(tmp_path / "assessments.sqlite3"))
+    store.save_many([
+        ("a", _record("Sam", "2024-05-01T09:00:00"), "Analytical Thinker"),
+        ("b", _record("sam", "2024-05-02T09:00:00"), "Creative Innovator"),
+        ("c", _record("Alex", "2024-05-02T10:00:00"), "Analytical Thinker"),
+    ])
+
+    assert [row["assessment_id"] for row in store.list()] == ["c", "b", "a"]
+    assert [row["assessment_id"] for row in store.list(name="SAM")] == ["b", "a"]
+    assert [row["assessment_id"] for row in store.list(date="2024-05-02")] == ["c", "b"]
+    assert [row["assessment_id"] for row in store.list(primary_type="Analytical Thinker", limit=1)] == ["c"]
+    assert [assessment_id for assessment_id, _ in store.iter_records(batch_size=2)] == ["a", "b", "c"]
+
+
+def test_close_drains_pending_writes(tmp_path):
+    path = str(tmp_path / "assessments.sqlite3")
+    store = ResultsStore(path)
+    writer = AsyncResultWriter(lambda: store, batch_size=4, flush_interval=0.01)
+    for index in range(10):
+        assert writer.submit(f"id-{index}", _record(f"user {index}"), "Analytical Thinker")
+    writer.close()
+
+    assert writer.saved == 10
+    assert writer.status("id-9") == "saved"
+    reopened = ResultsStore(path)
+    assert reopened.count() == 10
+    assert reopened.get("id-3")["name"] == "user 3"
+
+
+def test_close_is_idempotent_and_rejects_later_submissions(tmp_path):
+    store = ResultsStore(str(tmp_path / "assessments.sqlite3"))
+    writer = AsyncResultWriter(lambda: store, flush_interval=0.01)
+    writer.close()
+    writer.close()
+
+    assert not writer.submit("late", _record("late"))
+    assert writer.status("late") is None
+    assert not store.exists("late")
+
+
+def test_failed_batches_are_reported():
+    class BrokenStore:
+        def save_many(self, entries):
+            raise OSError("disk full")
+
+    writer = AsyncResultWriter(BrokenStore, flush_interval=0.01)
+    writer.submit("id-1", _record("user"))
+    writer.close()
+
+    assert writer.status("id-1") == "failed"
+    assert writer.stats()["failed"] == 1
+
+
+def test_full_queue_rejects_instead_of_blocking(tmp_path):
+    store = ResultsStore(str(tmp_path / "assessments.sqlite3"))
+    release = threading.Event()
+
+    class SlowStore:
+        def save_many(self, entries):
+            release.wait(5)
+            return store.save_many(entries)
+
+    writer = AsyncResultWriter(SlowStore, max_queue=1, batch_size=1, flush_interval=0.01)
+    accepted = [writer.submit(f"id-{index}", _record("user")) for index in range(5)]
+    release.set()
+    writer.close()
+
+    assert not all(accepted)
+    assert writer.rejected == accepted.count(False)
+    assert store.count() == accepted.count(True)
@@ -0,0 +1,434 @@
+"""Color themes and their stylesheets.
+
+Each theme's stylesheet is rendered from ``STYLESHEET_TEMPLATE`` and minified
+once per process, so app reruns reuse the same string instead of rebuilding
+the CSS every time.
+"""
+import re
+from functools import lru_cache
+
+COLOR_THEMES = {
+    'purple': {
+        'name': '🔮 Dark Purple',
+        'primary': '#2d1b69',
+        'secondary': '#4c2a85',
+        'background': '#1a1a2e',
+        'accent': '#3c1a5b',
+        'text': '#ffffff'
+    },
+    'ocean': {
+        'name': '🌊 Deep Ocean',
+        'primary': '#0a4b5c',
+        'secondary': '#1a237e',
+        'background': '#121921',
+        'accent': '#1565c0',
+        'text': '#ffffff'
+    },
+    'forest': {
+        'name': '🌲 Dark Forest',
+        'primary': '#1b4332',
+        'secondary': '#2d5016',
+        'background': '#0f1419',
+        'accent': '#2e7d32',
+        'text': '#ffffff'
+    },
+    'sunset': {
+        'name': '🌅 Dark Sunset',
+        'primary': '#6a1b5b',
+        'secondary': '#8e2de2',
+        'background': '#2d1b39',
+        'accent': '#7b1fa2',
+        'text': '#ffffff'
+    }
+}
+
+# Dynamic CSS based on selected theme; placeholders are filled from a COLOR_THEMES entry
+STYLESHEET_TEMPLATE = """
+<style>
+/* TEMPORARILY DISABLED HEADER HIDING FOR DEBUGGING */
+/*
+header[data-testid="stHeader"] {{
+    display: none !important;
+}}
+
+.stApp > header {{
+    display: none !important;
+}}
+
+.stApp > div[data-testid="stHeader"] {{
+    display: none !important;
+}}
+
+.stActionButton {{
+    display: none !important;
+}}
+
+.stApp > div:first-child {{
+    display: none !important;
+}}
+
+.stApp {{
+    margin-top: 0 !important;
+    padding-top: 0 !important;
+}}
+*/
+
+/* Main app background - dark theme */
+.stApp {{
+    background: {theme[background]} !important;
+    color: #e0e0e0 !important;
+}}
+
+/* Main content area dark styling */
+.main .block-container {{
+    background: {theme[background]} !important;
+    color: #e0e0e0 !important;
+}}
+
+/* Text elements dark styling */
+h1, h2, h3, h4, h5, h6, p, span, div {{
+    color: #e0e0e0 !important;
+}}
+
+/* Sidebar styling - dark gradient */
+.css-1d391kg, .css-1y4p8pa, [data-testid="stSidebar"] {{
+    background: linear-gradient(180deg, {theme[primary]}, {theme[secondary]}) !important;
+    border-right: 2px solid {theme[accent]} !important;
+}}
+
+/* All sidebar text elements */
+[data-testid="stSidebar"] * {{
+    color: white !important;
+}}
+
+/* Sidebar containers and text */
+.css-1d391kg, .css-1d391kg * {{
+    color: white !important;
+}}
+
+/* Sidebar markdown and headers */
+.css-1d391kg .stMarkdown, .css-1d391kg .stMarkdown * {{
+    color: white !important;
+}}
+
+.css-1d391kg h1, .css-1d391kg h2, .css-1d391kg h3, .css-1d391kg h4, .css-1d391kg h5, .css-1d391kg h6 {{
+    color: white !important;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.5) !important;
+}}
+
+/* Sidebar paragraphs and spans */
+.css-1d391kg p, .css-1d391kg span, .css-1d391kg div {{
+    color: white !important;
+}}
+
+/* Sidebar progress text */
+.css-1d391kg .stProgress + div, .css-1d391kg .stProgress ~ div {{
+    color: white !important;
+}}
+
+/* Status indicator text */
+.css-1d391kg .status-indicator + span, .css-1d391kg .status-indicator ~ span {{
+    color: white !important;
+}}
+
+/* Selectbox - better visibility on dark sidebar */
+.css-1d391kg .stSelectbox > div > div {{
+    background: white !important;
+    border-radius: 10px !important;
+    border: 2px solid {theme[accent]} !important;
+    color: #333333 !important;
+}}
+
+/* Selectbox dropdown menu */
+.css-1d391kg .stSelectbox [data-baseweb="select"] > div {{
+    background: white !important;
+    color: #333333 !important;
+}}
+
+/* Selectbox dropdown options */
+.css-1d391kg .stSelectbox [role="listbox"] {{
+    background: white !important;
+    color: #333333 !important;
+}}
+
+/* Individual dropdown options - comprehensive coverage */
+.css-1d391kg .stSelectbox [role="option"],
+.css-1d391kg .stSelectbox [role="option"]:hover,
+.css-1d391kg .stSelectbox [role="option"]:focus,
+.css-1d391kg .stSelectbox [role="option"]:active,
+section[data-testid="stSidebar"] .stSelectbox [role="option"],
+section[data-testid="stSidebar"] .stSelectbox [role="option"]:hover,
+section[data-testid="stSidebar"] .stSelectbox [role="option"]:focus,
+section[data-testid="stSidebar"] .stSelectbox [role="option"]:active,
+.stSelectbox [role="listbox"] [role="option"],
+.stSelectbox [role="listbox"] [role="option"]:hover,
+.stSelectbox [role="listbox"] [role="option"]:focus,
+.stSelectbox [role="listbox"] [role="option"]:active {{
+    background: white !important;
+    color: #333333 !important;
+    border: none !important;
+}}
+
+/* Selectbox dropdown container */
+.css-1d391kg .stSelectbox [role="listbox"],
+section[data-testid="stSidebar"] .stSelectbox [role="listbox"],
+.stSelectbox [role="listbox"] {{
+    background: white !important;
+    border: 1px solid #ccc !important;
+    border-radius: 4px !important;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.15) !important;
+}}
+
+/* Selectbox label */
+.css-1d391kg .stSelectbox label,
+section[data-testid="stSidebar"] .stSelectbox label {{
+    color: white !important;
+    font-weight: bold !important;
+}}
+
+/* Selectbox options */
+.css-1d391kg .stSelectbox option,
+section[data-testid="stSidebar"] .stSelectbox option {{
+    color: #333333 !important;
+    background: white !important;
+}}
+
+/* Selectbox dropdown */
+.css-1d391kg .stSelectbox [data-baseweb="select"],
+section[data-testid="stSidebar"] .stSelectbox [data-baseweb="select"] {{
+    background: white !important;
+    color: #333333 !important;
+}}
+
+/* Additional sidebar selectors for newer Streamlit versions */
+.st-emotion-cache-16idsys, .st-emotion-cache-16idsys * {{
+    color: white !important;
+}}
+
+section[data-testid="stSidebar"] {{
+    background: linear-gradient(180deg, {theme[primary]}, {theme[accent]}) !important;
+}}
+
+section[data-testid="stSidebar"] * {{
+    color: white !important;
+}}
+
+section[data-testid="stSidebar"] h1, 
+section[data-testid="stSidebar"] h2, 
+section[data-testid="stSidebar"] h3,
+section[data-testid="stSidebar"] h4,
+section[data-testid="stSidebar"] h5,
+section[data-testid="stSidebar"] h6 {{
+    color: white !important;
+    text-shadow: 1px 1px 2px rgba(0,0,0,0.3) !important;
+}}
+
+section[data-testid="stSidebar"] p,
+section[data-testid="stSidebar"] span,
+section[data-testid="stSidebar"] div:not(.stSelectbox) {{
+    color: white !important;
+}}
+
+/* Keep selectbox readable in newer versions */
+section[data-testid="stSidebar"] .stSelectbox > div > div {{
+    background: white !important;
+    color: #333333 !important;
+    border-radius: 10px !important;
+    border: 2px solid {theme[accent]} !important;
+}}
+
+/* Selectbox dropdown in newer versions */
+section[data-testid="stSidebar"] .stSelectbox [data-baseweb="select"] > div {{
+    background: white !important;
+    color: #333333 !important;
+}}
+
+/* Dropdown menu */
+section[data-testid="stSidebar"] .stSelectbox [role="listbox"] {{
+    background: white !important;
+    color: #333333 !important;
+}}
+
+/* Individual options */
+section[data-testid="stSidebar"] .stSelectbox [role="option"] {{
+    background: white !important;
+    color: #333333 !important;
+}}
+
+/* Selectbox labels in sidebar */
+section[data-testid="stSidebar"] .stSelectbox label {{
+    color: white !important;
+    font-weight: bold !important;
+}}
+
+.main {{
+    padding-top: 2rem;
+    background: {theme[background]} !important;
+}}
+.stTitle {{
+    color: #e0e0e0 !important;
+    text-align: center;
+    font-weight: 700;
+    margin-bottom: 1rem;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+}}
+.question-container {{
+    background: linear-gradient(135deg, {theme[primary]} 0%, {theme[secondary]} 100%);
+    color: white;
+    padding: 2rem;
+    border-radius: 15px;
+    margin: 1rem 0;
+    box-shadow: 0 8px 25px rgba(0,0,0,0.3);
+    border: 1px solid {theme[accent]};
+}}
+.question-container h3, .question-container h2 {{
+    color: white !important;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+}}
+
+/* Regular headers - dark theme */
+h1, h2, h3, h4, h5, h6 {{
+    color: #e0e0e0 !important;
+    text-shadow: 1px 1px 2px rgba(0,0,0,0.3) !important;
+}}
+.chat-container {{
+    background: linear-gradient(135deg, {theme[primary]}20, {theme[secondary]}20);
+    padding: 1.5rem;
+    border-radius: 15px;
+    border-left: 4px solid {theme[accent]};
+    margin: 1rem 0 2rem 0;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+    color: #e0e0e0;
+    border: 1px solid {theme[accent]}40;
+}}
+.chat-container h4 {{
+    color: {theme[accent]};
+    margin-bottom: 1rem;
+    text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
+}}
+.progress-container {{
+    background: linear-gradient(135deg, {theme[primary]}15, {theme[secondary]}15);
+    padding: 1.5rem;
+    border-radius: 15px;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+    margin-bottom: 2rem;
+    border: 1px solid {theme[accent]};
+    color: #e0e0e0;
+}}
+
+/* All buttons default styling */
+.stButton > button,
+button[kind="primary"],
+button[kind="secondary"],
+div[data-testid="stButton"] > button {{
+    background: linear-gradient(135deg, {theme[primary]} 0%, {theme[secondary]} 100%) !important;
+    color: white !important;
+    border: none !important;
+    border-radius: 25px !important;
+    padding: 0.75rem 2rem !important;
+    font-weight: 600 !important;
+    font-size: 1.1rem !important;
+    transition: all 0.3s ease !important;
+    box-shadow: 0 4px 15px rgba(0,0,0,0.2) !important;
+    width: 100% !important;
+    opacity: 1 !important;
+}}
+.stButton > button:hover,
+button[kind="primary"]:hover,
+button[kind="secondary"]:hover,
+div[data-testid="stButton"] > button:hover {{
+    transform: translateY(-2px) !important;
+    box-shadow: 0 6px 20px rgba(0,0,0,0.3) !important;
+    background: linear-gradient(135deg, {theme[accent]} 0%, {theme[primary]} 100%) !important;
+}}
+.stButton > button:disabled,
+button[kind="primary"]:disabled,
+button[kind="secondary"]:disabled,
+div[data-testid="stButton"] > button:disabled {{
+    background: linear-gradient(135deg, {theme[primary]} 0%, {theme[secondary]} 100%) !important;
+    color: white !important;
+    opacity: 0.7 !important;
+    cursor: not-allowed !important;
+    transform: none !important;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.1) !important;
+}}
+.stButton > button:disabled:hover {{
+    background: linear-gradient(135deg, {theme[primary]} 0%, {theme[secondary]} 100%) !important;
+    transform: none !important;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.1) !important;
+}}
+
+/* Skip button special styling for better visibility */
+[title*="Skip"] {{
+    background: white !important;
+    color: #333333 !important;
+    border: 2px solid {theme[accent]} !important;
+}}
+
+.status-indicator {{
+    display: inline-block;
+    width: 12px;
+    height: 12px;
+    border-radius: 50%;
+    margin-right: 8px;
+}}
+.status-connected {{
+    background-color: #4CAF50;
+}}
+.status-disconnected {{
+    background-color: #f44336;
+}}
+.theme-selector {{
+    background: linear-gradient(135deg, {theme[primary]}20, {theme[secondary]}20);
+    padding: 1rem;
+    border-radius: 15px;
+    border: 1px solid {theme[accent]};
+    margin-bottom: 1rem;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.2);
+    color: #e0e0e0;
+}}
+
+/* Text areas - light background with dark text */
+.stTextArea > div > div > textarea {{
+    background: white !important;
+    border: 2px solid {theme[accent]} !important;
+    border-radius: 15px !important;
+    color: #333333 !important;
+    font-size: 1.1rem;
+}}
+
+/* Input fields - light background with dark text */
+.stTextInput > div > div > input {{
+    background: white !important;
+    border: 2px solid {theme[accent]} !important;
+    border-radius: 15px !important;
+    color: #333333 !important;
+    font-size: 1.1rem;
+}}
+
+/* Progress bar */
+.stProgress > div > div > div {{
+    background: linear-gradient(90deg, {theme[accent]}, {theme[primary]}) !important;
+}}
+</style>
+"""
+
+
+def render_stylesheet(theme):
+    """Stylesheet for a theme dict, exactly as written in the template"""
+    return STYLESHEET_TEMPLATE.format(theme=theme)
+
+
+def minify_css(css):
+    """Drop comments and insignificant whitespace"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=None)
+def theme_stylesheet(theme_key):
+    """Minified ``<style>`` block for one of COLOR_THEMES, built once per process"""
+    return minify_css(render_stylesheet(COLOR_THEMES[theme_key]))
@@ -1,8 +1,8 @@
 import streamlit as st
 import json
 from datetime import datetime
-import pandas as pd
 from config import ASSESSMENT_CATEGORIES, MENTAL_HEALTH_INDICATORS
+from lazy import pandas as pd
 
 def export_results_to_csv(responses, questions, analysis):
     """Export assessment results to CSV format"""